@@ -1,3 +1,4 @@
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -50,6 +51,13 @@ class Settings(BaseSettings):
     llm_max_retries: int = 2  # LLM 调用失败重试次数（指数退避）
     llm_retry_delay: float = 2.0  # 首次重试延迟（秒），后续 2x 递增
     llm_max_concurrent: int = 3  # 全局 LLM 并发上限
+    llm_max_output_tokens: int = 0  # 调用方未指定 num_predict 时的输出上限，0 表示不限制（thinking 也计入）
+    llm_http_max_connections: int = 64  # LLM httpx 连接池上限（所有任务共享）
+    llm_http_keepalive: int = 32  # 连接池中保持的空闲 keep-alive 连接数
+    llm_http2: bool = False  # 远程 https LLM 启用 HTTP/2 多路复用（需安装 copernicus[http2]）
+    llm_rpm: int = 0  # 每分钟请求数上限（令牌桶），0 表示不限制
+    llm_tpm: int = 0  # 每分钟 token 数上限（按 prompt 字符数估算），0 表示不限制
+    llm_structured_output: bool = True  # 批量纠错以 JSON Schema 约束输出（Ollama >= 0.5），旧版本设为 False 回退 format=json
     ollama_num_ctx: int = 32768
     ollama_num_ctx_correction: int = 4096
 
@@ -57,6 +65,10 @@ class Settings(BaseSettings):
     correction_chunk_size: int = 800
     correction_overlap: int = 50
     correction_max_concurrency: int = 3
+    correction_cache_enabled: bool = True  # 按内容哈希缓存 LLM 纠正结果，重跑/重复片段不再请求 LLM
+    correction_cache_size: int = 4096  # 缓存条目上限（LRU 淘汰）
+    segment_batch_size: int = 15  # correct_segments 单次 LLM 请求打包的片段数
+    min_correction_chars: int = 2  # 去空白后短于此长度的片段不送 LLM（如单字语气词）
 
     # 热词后处理替换（阶段 2）
     hotword_replacer_enabled: bool = True
@@ -76,6 +88,7 @@ class Settings(BaseSettings):
     evaluation_max_text_chars: int = 50000  # 总上限，超过则截断
     evaluation_chunk_size: int = 6000       # Map 分段大小（字符），短于此直接评估
     evaluation_num_ctx: int = 8192          # 评估专用 num_ctx，控制显存占用
+    evaluation_hedge_after_seconds: float = 0.0  # 首次评估超过该秒数未返回时并发补发一次，0 表示关闭
 
     # Compliance Audit (Map-Reduce)
     compliance_max_text_chars: int = 50000
@@ -94,6 +107,8 @@ class Settings(BaseSettings):
     # Task execution
     task_timeout_seconds: int = 3600  # 单任务超时（秒），防止 ASR/LLM 卡住
     task_max_in_memory: int = 500  # 内存中最大任务数，超出时淘汰最早的已完成任务
+    task_ttl_seconds: int = 0  # 已完成/失败任务在内存中的保留时长（秒），0 表示只按数量淘汰；结果仍可从磁盘读取
+    task_max_workers: int = 2  # 并发执行的后台任务数，超出的任务排队等待（防止 GPU OOM / LLM 限流）
 
     # CORS
     cors_origins: list[str] = ["http://localhost:3000"]
@@ -124,33 +139,51 @@ class Settings(BaseSettings):
     upload_dir: Path = Path("./uploads")
     max_upload_size_mb: int = 500
 
-    @property
+    @cached_property
     def max_upload_size_bytes(self) -> int:
         return self.max_upload_size_mb * 1024 * 1024
 
-    def resolve_asr_device(self) -> str:
-        import logging
-        _logger = logging.getLogger(__name__)
+    @cached_property
+    def video_extension_set(self) -> frozenset[str]:
+        return frozenset(
+            e.strip().lower() for e in self.video_extensions.split(",") if e.strip()
+        )
 
+    def resolve_asr_device(self) -> str:
         if self.asr_device != "auto":
             return self.asr_device
-        try:
-            import torch
-
-            if torch.cuda.is_available():
-                _logger.info(
-                    "CUDA available: %s (VRAM: %.1f GB)",
-                    torch.cuda.get_device_name(0),
-                    torch.cuda.get_device_properties(0).total_memory / 1024**3,
-                )
-                return "cuda"
-            _logger.warning(
-                "CUDA not available. Check: 1) torch+cu12x installed 2) NVIDIA driver"
+        return _detect_asr_device()
+
+
+# torch 导入与 CUDA 探测代价高（数百 ms），进程内只做一次
+@lru_cache(maxsize=1)
+def _detect_asr_device() -> str:
+    import logging
+    _logger = logging.getLogger(__name__)
+
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            _logger.info(
+                "CUDA available: %s (VRAM: %.1f GB)",
+                torch.cuda.get_device_name(0),
+                torch.cuda.get_device_properties(0).total_memory / 1024**3,
             )
-            return "cpu"
-        except ImportError:
-            _logger.warning("PyTorch not installed, falling back to CPU")
-            return "cpu"
+            return "cuda"
+        _logger.warning(
+            "CUDA not available. Check: 1) torch+cu12x installed 2) NVIDIA driver"
+        )
+        return "cpu"
+    except ImportError:
+        _logger.warning("PyTorch not installed, falling back to CPU")
+        return "cpu"
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """返回进程内唯一的 Settings 实例（只读取一次环境变量 / .env）。"""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
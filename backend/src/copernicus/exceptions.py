@@ -16,3 +16,7 @@ class CorrectionError(CopernicusError):
 
 class ComplianceError(CopernicusError):
     """Raised when compliance audit fails."""
+
+
+class UploadTooLargeError(CopernicusError):
+    """Raised when an uploaded file exceeds the configured size limit."""
@@ -79,11 +79,18 @@ async def lifespan(app: FastAPI):
             compliance=app.state.compliance,
         )
         app.state.task_store.restore_from_disk()
+        app.state.task_store.start()
 
         logger.info("Copernicus service ready.")
         yield
     finally:
         logger.info("Shutting down Copernicus service ...")
+        task_store = getattr(app.state, "task_store", None)
+        if task_store is not None:
+            await task_store.stop()
+        pipeline = getattr(app.state, "pipeline", None)
+        if pipeline is not None:
+            pipeline.close()
         await llm_client.close()
 
 
@@ -69,11 +69,10 @@ async def update_violation_statuses(
 ) -> dict:
     """Persist violation review statuses (confirmed / rejected / pending)."""
     persistence = store.persistence
-    data = persistence.load_json(task_id, "compliance.json")
-    if data is None:
+    compliance = persistence.load_model(task_id, "compliance.json", ComplianceResponse)
+    if compliance is None:
         raise HTTPException(status_code=404, detail="compliance.json not found")
 
-    compliance = ComplianceResponse.model_validate(data)
     violations = compliance.report.violations
 
     for u in body.updates:
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import mimetypes
 from pathlib import Path
@@ -7,6 +8,7 @@ from fastapi.responses import FileResponse
 
 from copernicus.config import settings
 from copernicus.dependencies import get_task_store
+from copernicus.exceptions import UploadTooLargeError
 from copernicus.schemas.compliance import ComplianceResponse
 from copernicus.schemas.evaluation import EvaluationResult
 from copernicus.schemas.task import (
@@ -17,17 +19,20 @@ from copernicus.schemas.task import (
 )
 from copernicus.schemas.transcription import TranscriptResponse
 from copernicus.services.task_store import TaskStore
-from copernicus.utils.request import parse_hotwords
+from copernicus.utils.request import parse_hotwords, read_upload
 
-_VIDEO_EXTENSIONS = {
-    e.strip().lower()
-    for e in settings.video_extensions.split(",")
-    if e.strip()
-}
+_VIDEO_EXTENSIONS = settings.video_extension_set
+
+# 上传大小上限在导入时绑定，请求路径上不再访问 settings
+_MAX_UPLOAD_BYTES = settings.max_upload_size_bytes
 
 router = APIRouter(prefix="/api/v1", tags=["tasks"])
 
 
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
 @router.post("/tasks/transcript", response_model=TaskSubmitResponse, status_code=202)
 async def submit_transcript_task(
     file: UploadFile = File(...),
@@ -35,13 +40,14 @@ async def submit_transcript_task(
     store: TaskStore = Depends(get_task_store),
 ) -> TaskSubmitResponse:
     """Submit an async transcript task with timestamps and speaker labels."""
-    audio_bytes = await file.read()
-
-    if len(audio_bytes) > settings.max_upload_size_bytes:
+    try:
+        audio_bytes = await read_upload(file, _MAX_UPLOAD_BYTES)
+    except UploadTooLargeError:
         raise HTTPException(status_code=413, detail="File too large")
 
-    # file dedup via SHA-256
-    file_hash = hashlib.sha256(audio_bytes).hexdigest()
+    # file dedup via SHA-256; hashing and disk writes of large uploads run in a
+    # worker thread so the event loop keeps serving other requests
+    file_hash = await asyncio.to_thread(_sha256_hex, audio_bytes)
     existing_id = store.lookup_by_hash(file_hash)
     if existing_id:
         return TaskSubmitResponse(
@@ -52,18 +58,19 @@ async def submit_transcript_task(
         hw = parse_hotwords(hotwords)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    task_id = store.submit_transcript(
-        audio_bytes, file.filename or "upload.bin", hw, file_hash=file_hash
-    )
 
-    # persist media and meta to task directory
+    # persist media and meta before enqueueing: an idle worker may start the
+    # pipeline as soon as the task is queued, and it reads the task directory
     persistence = store.persistence
+    task_id = store.new_task_id()
     filename = file.filename or "upload.bin"
     suffix = Path(filename).suffix or ".bin"
     is_video = suffix.lower() in _VIDEO_EXTENSIONS
 
     if is_video:
-        video_path = persistence.save_video(task_id, audio_bytes, suffix)
+        media_path = await asyncio.to_thread(
+            persistence.save_video, task_id, audio_bytes, suffix
+        )
         persistence.save_meta(
             task_id,
             filename=filename,
@@ -72,17 +79,22 @@ async def submit_transcript_task(
             media_type="video",
             video_suffix=suffix,
         )
-        task = store.get(task_id)
-        if task:
-            task.audio_path = str(video_path)
     else:
-        audio_path = persistence.save_audio(task_id, audio_bytes, suffix)
+        media_path = await asyncio.to_thread(
+            persistence.save_audio, task_id, audio_bytes, suffix
+        )
         persistence.save_meta(
             task_id, filename=filename, file_hash=file_hash, audio_suffix=suffix
         )
-        task = store.get(task_id)
-        if task:
-            task.audio_path = str(audio_path)
+
+    store.submit_transcript(
+        audio_bytes,
+        filename,
+        hw,
+        task_id=task_id,
+        file_hash=file_hash,
+        audio_path=str(media_path),
+    )
 
     return TaskSubmitResponse(task_id=task_id, status=TaskStatus.PENDING)
 
@@ -154,20 +166,9 @@ async def get_task_results(
         if task is None:
             raise HTTPException(status_code=404, detail="Task not found")
 
-    transcript = None
-    transcript_data = persistence.load_json(task_id, "transcript.json")
-    if transcript_data:
-        transcript = TranscriptResponse.model_validate(transcript_data)
-
-    evaluation = None
-    eval_data = persistence.load_json(task_id, "evaluation.json")
-    if eval_data:
-        evaluation = EvaluationResult.model_validate(eval_data)
-
-    compliance = None
-    compliance_data = persistence.load_json(task_id, "compliance.json")
-    if compliance_data:
-        compliance = ComplianceResponse.model_validate(compliance_data)
+    transcript = persistence.load_model(task_id, "transcript.json", TranscriptResponse)
+    evaluation = persistence.load_model(task_id, "evaluation.json", EvaluationResult)
+    compliance = persistence.load_model(task_id, "compliance.json", ComplianceResponse)
 
     has_audio = persistence.find_audio(task_id) is not None
     has_video = persistence.find_video(task_id) is not None
@@ -180,7 +181,8 @@ async def get_task_results(
     events_data = persistence.load_json(task_id, "visual_events.json")
     visual_event_count = len(events_data) if isinstance(events_data, list) else 0
 
-    return TaskResultsResponse(
+    # 子结果均已由 load_model 校验，外层仅做组装，跳过重复校验
+    return TaskResultsResponse.model_construct(
         task_id=task_id,
         transcript=transcript,
         evaluation=evaluation,
@@ -234,7 +236,8 @@ async def get_task_status(
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return TaskStatusResponse(
+    # task 字段由 TaskStore 内部维护，result 已是 schema 实例，跳过重复校验
+    return TaskStatusResponse.model_construct(
         task_id=task.task_id,
         status=task.status,
         progress=task.progress,
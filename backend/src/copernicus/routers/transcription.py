@@ -1,15 +1,23 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 
 from copernicus.config import settings
 from copernicus.dependencies import get_pipeline
-from copernicus.exceptions import CopernicusError
+from copernicus.exceptions import CopernicusError, UploadTooLargeError
 from copernicus.schemas.transcription import (
     HealthResponse,
     TranscriptEntrySchema,
     TranscriptResponse,
 )
 from copernicus.services.pipeline import PipelineService
-from copernicus.utils.request import parse_hotwords
+from copernicus.utils.request import parse_hotwords, read_upload
+
+# 上传大小上限在导入时绑定，请求路径上不再访问 settings
+_MAX_UPLOAD_BYTES = settings.max_upload_size_bytes
+
+# 健康检查探测 LLM 的超时，避免上游缓慢拖住 readiness probe
+_HEALTH_PROBE_TIMEOUT = 2.0
 
 router = APIRouter(prefix="/api/v1", tags=["transcription"])
 
@@ -21,9 +29,9 @@ async def transcribe_transcript(
     pipeline: PipelineService = Depends(get_pipeline),
 ) -> TranscriptResponse:
     """Upload an audio file and get speaker-segmented transcript with timestamps."""
-    audio_bytes = await file.read()
-
-    if len(audio_bytes) > settings.max_upload_size_bytes:
+    try:
+        audio_bytes = await read_upload(file, _MAX_UPLOAD_BYTES)
+    except UploadTooLargeError:
         raise HTTPException(status_code=413, detail="File too large")
 
     try:
@@ -36,9 +44,10 @@ async def transcribe_transcript(
     except CopernicusError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    return TranscriptResponse(
+    # 条目来自内部 TranscriptEntry，字段类型已确定，跳过逐条校验
+    return TranscriptResponse.model_construct(
         transcript=[
-            TranscriptEntrySchema(
+            TranscriptEntrySchema.model_construct(
                 timestamp=entry.timestamp,
                 timestamp_ms=entry.timestamp_ms,
                 speaker=entry.speaker,
@@ -57,5 +66,10 @@ async def health(
 ) -> HealthResponse:
     """Check service health: ASR model loaded and LLM reachable."""
     asr_loaded = pipeline._asr is not None
-    llm_reachable = await pipeline._corrector.is_reachable()
+    try:
+        llm_reachable = await asyncio.wait_for(
+            pipeline._corrector.is_reachable(), timeout=_HEALTH_PROBE_TIMEOUT
+        )
+    except TimeoutError:
+        llm_reachable = False
     return HealthResponse(asr_loaded=asr_loaded, llm_reachable=llm_reachable)
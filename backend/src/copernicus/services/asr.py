@@ -25,6 +25,17 @@ _EMOJI_RE = re.compile(
 _REPEATED_PUNC_RE = re.compile(r"[。，、！？；：]{2,}")
 _ISOLATED_PUNC_RE = re.compile(r"^\s*[。，、！？；：]+\s*$")
 
+# 标点字符集合（模块级常量，避免每次调用重建 set）
+# _PUNC_CHARS: 置信度对齐时跳过的字符（ASR token_conf 不含标点）
+_PUNC_CHARS = frozenset("。！？；，、：\u201c\u201d\u2018\u2019（）《》【】…—·\n.!?;,:\"'()[]")
+# _PUNC_RE: 与 _PUNC_CHARS 同集合的字符类，用于在 C 层统计标点数
+# （str.translate 对非 Latin-1 字符走 dict 查表，实测比逐字符循环还慢）
+_PUNC_RE = re.compile("[" + re.escape("".join(sorted(_PUNC_CHARS))) + "]")
+# _SPLIT_PUNC_CHARS: 超长段落的自然切分点
+_SPLIT_PUNC_CHARS = frozenset("。！？；，、：.!?;,:")
+# _NOISE_PUNC_RE: 噪声判定前把标点/空格连续段一次性替换为空格
+_NOISE_PUNC_RE = re.compile(r"[。，、！？；：.!?;,: ]+")
+
 # ASR 推理常量
 _PARAFORMER_VAD_MAX_SEGMENT_MS = 30000  # Paraformer VAD 单段最长时间
 _PARAFORMER_MERGE_LENGTH_S = 60         # Paraformer 模型每次最长合并秒数
@@ -400,9 +411,6 @@ class ASRService:
         if not timestamps or len(timestamps) < 2:
             return [{"text": text, "start": 0, "end": 0}]
 
-        # 标点符号集合（自然切分点）
-        punc_chars = set("。！？；，、：.!?;,:")
-
         results: list[dict] = []
         current_start_idx = 0
         current_start_ms = timestamps[0][0]
@@ -417,7 +425,7 @@ class ASRService:
                 # 向前搜索最近的标点符号作为切分点
                 split_idx = i
                 for j in range(i, current_start_idx, -1):
-                    if j < len(text) and text[j] in punc_chars:
+                    if j < len(text) and text[j] in _SPLIT_PUNC_CHARS:
                         split_idx = j + 1
                         break
 
@@ -477,9 +485,7 @@ class ASRService:
         }
 
         # 去除标点和空白后检查
-        cleaned = text.strip().lower()
-        for punc in "。，、！？；：.!?;,: ":
-            cleaned = cleaned.replace(punc, " ")
+        cleaned = _NOISE_PUNC_RE.sub(" ", text.strip().lower())
         cleaned = " ".join(cleaned.split())  # 规范化空白
 
         # 空文本
@@ -928,22 +934,23 @@ class ASRService:
         if not token_conf:
             return [Segment(text=s) for s in sentences]
 
-        punc_chars = set("。！？；，、：\u201c\u201d\u2018\u2019（）《》【】…—·\n.!?;,:\"'()[]")
-        segments: list[Segment] = []
-        conf_idx = 0
-
-        for sent in sentences:
-            scores: list[float] = []
-            for ch in sent:
-                if ch in punc_chars:
-                    continue
-                if conf_idx < len(token_conf):
-                    scores.append(token_conf[conf_idx])
-                    conf_idx += 1
-            avg_conf = sum(scores) / len(scores) if scores else 0.0
-            segments.append(Segment(text=sent, confidence=avg_conf))
-
-        return segments
+        # 每句非标点字符数即该句消耗的 token 数；前缀和一次求出所有句均值
+        counts = np.fromiter(
+            (len(sent) - len(_PUNC_RE.findall(sent)) for sent in sentences),
+            dtype=np.int64,
+            count=len(sentences),
+        )
+        ends = np.minimum(np.cumsum(counts), len(token_conf))
+        starts = np.concatenate(([0], ends[:-1]))
+        cum = np.concatenate(([0.0], np.cumsum(np.asarray(token_conf, dtype=np.float64))))
+        sums = cum[ends] - cum[starts]
+        n = ends - starts
+        means = np.divide(sums, n, out=np.zeros_like(sums), where=n > 0)
+
+        return [
+            Segment(text=sent, confidence=conf)
+            for sent, conf in zip(sentences, means.tolist())
+        ]
 
     @staticmethod
     def _build_segments_from_sentence_info(
@@ -951,48 +958,53 @@ class ASRService:
         token_conf: list[float],
     ) -> list[Segment]:
         """Build Segment objects from FunASR sentence_info with timestamps and speaker."""
-        segments: list[Segment] = []
-        conf_offset = 0
-
-        for item in sentence_info:
-            text = item.get("text", "")
-            start = item.get("start", 0)
-            end = item.get("end", 0)
-            spk = item.get("spk", -1)
-
-            timestamps = item.get("timestamp", [])
-            n_tokens = len(timestamps)
-
-            if token_conf and n_tokens > 0 and conf_offset < len(token_conf):
-                chunk = token_conf[conf_offset : conf_offset + n_tokens]
-                avg_conf = sum(chunk) / len(chunk) if chunk else 0.0
-                conf_offset += n_tokens
-            else:
-                avg_conf = 0.0
-
-            segments.append(
-                Segment(
-                    text=text,
-                    start_ms=start,
-                    end_ms=end,
-                    confidence=avg_conf,
-                    speaker=spk,
-                )
+        n_items = len(sentence_info)
+        if token_conf:
+            # 每句 timestamp 数即该句 token 数；与 _build_segments_from_sentences 同一前缀和做法
+            counts = np.fromiter(
+                (len(item.get("timestamp", [])) for item in sentence_info),
+                dtype=np.int64,
+                count=n_items,
             )
-        return segments
+            ends = np.minimum(np.cumsum(counts), len(token_conf))
+            starts = np.concatenate(([0], ends[:-1]))
+            cum = np.concatenate(([0.0], np.cumsum(np.asarray(token_conf, dtype=np.float64))))
+            sums = cum[ends] - cum[starts]
+            n = ends - starts
+            means = np.divide(sums, n, out=np.zeros_like(sums), where=n > 0).tolist()
+        else:
+            means = [0.0] * n_items
+
+        return [
+            Segment(
+                text=item.get("text", ""),
+                start_ms=item.get("start", 0),
+                end_ms=item.get("end", 0),
+                confidence=conf,
+                speaker=item.get("spk", -1),
+            )
+            for item, conf in zip(sentence_info, means)
+        ]
 
     @staticmethod
     def _log_confidence_stats(segments: list[Segment]) -> None:
         """Log confidence statistics for segments."""
-        if not segments or segments[0].confidence == 0.0:
+        if (
+            not segments
+            or segments[0].confidence == 0.0
+            or not logger.isEnabledFor(logging.INFO)
+        ):
             return
 
-        confs = [s.confidence for s in segments]
+        # 一次 fromiter 物化后由 NumPy 做向量化归约，避免四次 Python 遍历
+        confs = np.fromiter(
+            (s.confidence for s in segments), dtype=np.float64, count=len(segments)
+        )
         logger.info(
             "Confidence stats: min=%.4f, max=%.4f, avg=%.4f, >=0.95: %d/%d",
-            min(confs),
-            max(confs),
-            sum(confs) / len(confs),
-            sum(1 for c in confs if c >= 0.95),
-            len(confs),
+            confs.min(),
+            confs.max(),
+            confs.mean(),
+            int(np.count_nonzero(confs >= 0.95)),
+            confs.size,
         )
@@ -14,11 +14,13 @@ Author: afu
 import asyncio
 import csv
 import io
-import json
 import logging
 import re
 from collections.abc import Iterable
 
+import numpy as np
+import orjson
+
 from copernicus.config import Settings
 from copernicus.exceptions import ComplianceError
 from copernicus.schemas.compliance import ComplianceReport, ComplianceRule, Violation
@@ -191,6 +193,9 @@ class ComplianceService:
         if on_progress:
             on_progress(0, total_steps)
 
+        # OCR 时间戳只提取一次，各 chunk 对齐时复用
+        ocr_ts = _ocr_timestamps(ocr_results) if ocr_results else None
+
         # Map: 并发审核各 chunk x 各规则组
         completed = 0
         lock = asyncio.Lock()
@@ -206,7 +211,10 @@ class ComplianceService:
             include_ocr = group_name in ("ocr", "mixed", "all") and ocr_results
             chunk_ocr = (
                 _align_ocr_to_chunk(
-                    chunk, ocr_results, self._settings.compliance_ocr_margin_ms
+                    chunk,
+                    ocr_results,
+                    self._settings.compliance_ocr_margin_ms,
+                    ocr_ts=ocr_ts,
                 )
                 if include_ocr
                 else None
@@ -498,14 +506,25 @@ class ComplianceService:
 # ------------------------------------------------------------------ #
 
 
+def _ocr_timestamps(ocr_results: list[dict]) -> np.ndarray:
+    """提取 OCR 记录时间戳为 int64 数组，一次审核内各 chunk 共用。"""
+    return np.fromiter(
+        (int(o.get("timestamp_ms", 0)) for o in ocr_results),
+        dtype=np.int64,
+        count=len(ocr_results),
+    )
+
+
 def _align_ocr_to_chunk(
     entries: list[dict],
     ocr_results: list[dict],
     margin_ms: int = 5000,
+    ocr_ts: np.ndarray | None = None,
 ) -> list[dict]:
     """筛选与 chunk 时间范围重叠的 OCR 记录。
 
-    去重（同帧同文本只保留一次），按时间排序。
+    去重（同帧同文本只保留一次），按时间排序。时间窗筛选与排序在 NumPy
+    中完成；``ocr_ts`` 可传入预先提取的时间戳数组，避免每个 chunk 重复提取。
     """
     if not entries or not ocr_results:
         return []
@@ -516,15 +535,19 @@ def _align_ocr_to_chunk(
     range_start = chunk_start - margin_ms
     range_end = chunk_end + margin_ms
 
-    # 筛选 + 去重
+    if ocr_ts is None:
+        ocr_ts = _ocr_timestamps(ocr_results)
+
+    # 向量化时间窗筛选，稳定排序保证同时间戳记录保持原始先后（去重保留首条）
+    idx = np.flatnonzero((ocr_ts >= range_start) & (ocr_ts <= range_end))
+    idx = idx[np.argsort(ocr_ts[idx], kind="stable")]
+
+    # 去重只作用于窗口内的少量记录
     seen: set[tuple[int, str]] = set()
     aligned: list[dict] = []
 
-    for ocr in ocr_results:
-        ocr_ms = int(ocr.get("timestamp_ms", 0))
-        if ocr_ms < range_start or ocr_ms > range_end:
-            continue
-
+    for i, ocr_ms in zip(idx.tolist(), ocr_ts[idx].tolist()):
+        ocr = ocr_results[i]
         text = ocr.get("text", "").strip()
         if not text:
             continue
@@ -535,7 +558,6 @@ def _align_ocr_to_chunk(
         seen.add(key)
         aligned.append(ocr)
 
-    aligned.sort(key=lambda r: r.get("timestamp_ms", 0))
     return aligned
 
 
@@ -607,7 +629,7 @@ def _parse_violations(
     accurate value looked up by the ``timestamp`` string key.
     """
     content = extract_json_array(raw)
-    data = json.loads(content)
+    data = orjson.loads(content)
 
     # 如果 LLM 输出了对象而非数组
     if isinstance(data, dict):
@@ -15,8 +15,6 @@ import os
 import re
 from typing import TYPE_CHECKING
 
-from pypinyin import lazy_pinyin
-
 from copernicus.schemas.compliance import Violation
 from copernicus.services.rule_registry import RuleRegistry
 
@@ -269,6 +267,8 @@ def run_filters(
 
 def _text_to_pinyin(text: str) -> list[str]:
     """将中文文本转为拼音音节列表（小写，无声调）。"""
+    from pypinyin import lazy_pinyin  # 延迟导入，见 rule_registry._exact_pinyin_index
+
     return lazy_pinyin(text)
 
 
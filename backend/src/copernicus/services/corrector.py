@@ -1,13 +1,19 @@
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import re
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+import orjson
 
 from copernicus.services.llm import OllamaClient
 from copernicus.services.text_corrector import TextCorrectorService
 from copernicus.services.hotword_replacer import HotwordReplacerService
 from copernicus.config import Settings
-from copernicus.utils.llm_parse import strip_think_tags
+from copernicus.utils.llm_parse import strip_llm_wrappers, strip_think_tags
 from copernicus.utils.text import chunk_text, merge_chunks
 from copernicus.utils.types import ProgressCallback
 
@@ -51,6 +57,12 @@ _REPEAT_PATTERNS = [
 # 英文噪声前缀清理
 _EN_NOISE_PREFIX_RE = re.compile(r"^\s*(?:the\s+)+", re.IGNORECASE)
 
+# 纯标点判定：一次 sub 去掉全部标点与空格
+_STRIP_PUNC_RE = re.compile(r"[，。、！？；：,.!?;: ]+")
+
+# JSON 解析失败时的兜底：逐条提取 {"id": N, "text": "..."}
+_ENTRY_PAIR_RE = re.compile(r'"id"\s*:\s*(\d+)\s*,\s*"text"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
 # ============================================================
 # 数字规范化：中文数字 -> 阿拉伯数字
 # ============================================================
@@ -112,9 +124,7 @@ def preprocess_text(text: str) -> str | None:
     cleaned = _FOUR_DIGIT_CN_RE.sub(_cn_digits_to_arabic, cleaned)
 
     # 5. 检查清理后是否为空或纯标点
-    stripped = cleaned
-    for punc in "，。、！？；：,.!?;: ":
-        stripped = stripped.replace(punc, "")
+    stripped = _STRIP_PUNC_RE.sub("", cleaned)
     if not stripped:
         return None
 
@@ -154,6 +164,115 @@ TRANSCRIPT_SYSTEM_PROMPT = """\
 【输出示例】
 {"entries": [{"id": 1, "text": "今天的会议主要是关于明年的计划。"}, {"id": 2, "text": "我觉得这个方案还是可以的，需要再优化一下。"}]}"""
 
+# correct_segments 的批量协议：沿用 transcript 的 JSON 收发格式，
+# 但规则与 SYSTEM_PROMPT 一致，只做校对、不做润色（不删填充词、不调语序）
+SEGMENT_SYSTEM_PROMPT = """\
+你是一个专业的文本校对工具。
+输入是一个JSON对象，entries字段包含句子ID和ASR语音转写的原始内容。
+任务：逐条校对每个 text 字段，输出修正后的文本。
+
+规则：
+1. 绝对严禁修改 id 字段，严禁合并或拆分句子。
+2. 修正同音字错误（如"受权"->"授权"）。
+3. 修正错误标点符号，使其符合阅读习惯。
+4. 保持原句意，不要重写或删减内容。
+5. 如果文本包含无法确定的口语，保留原样。
+6. 输出必须是包含 entries 字段的JSON对象，严禁输出任何开场白、解释或Markdown标记。
+
+【输入示例】
+{"entries": [{"id": 1, "text": "那个我们已经受权给他们了"}]}
+
+【输出示例】
+{"entries": [{"id": 1, "text": "那个我们已经授权给他们了。"}]}"""
+
+# 批量纠错的输出结构；启用 structured output 时由 Ollama 按 schema 约束解码，
+# 输出必为合法 JSON，正则兜底仅在 num_predict 截断时才会触发
+TRANSCRIPT_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "entries": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "text": {"type": "string"},
+                },
+                "required": ["id", "text"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["entries"],
+    "additionalProperties": False,
+}
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+async def _bounded_gather(
+    fn: Callable[[int, _T], Awaitable[_R]],
+    items: Sequence[_T],
+    limit: int,
+) -> list[_R]:
+    """按原顺序返回 fn(i, item) 的结果，同一时刻最多存在 limit 个 task。
+
+    实例信号量限制的是并发 LLM 请求；这里再限制已创建的 task 数，
+    长转写不会一次性实例化上万个协程去排队等信号量。
+    """
+    results: list[Any] = [None] * len(items)
+
+    async def _run(i: int, item: _T) -> None:
+        results[i] = await fn(i, item)
+
+    pending: set[asyncio.Task[None]] = set()
+    try:
+        for i, item in enumerate(items):
+            if len(pending) >= limit:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()  # 传播异常
+            pending.add(asyncio.create_task(_run(i, item)))
+        await asyncio.gather(*pending)
+        pending = set()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+
+class _CorrectionCache:
+    """进程内 LRU：(model, temperature, prompt, 输入) 哈希 -> LLM 纠正结果。
+
+    仅缓存 LLM 成功返回的结果，fallback 原文不入缓存，下次仍会重试。
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._data: OrderedDict[bytes, Any] = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Any | None:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
 
 class CorrectorService:
     def __init__(
@@ -169,9 +288,56 @@ class CorrectorService:
         self._chunk_size = settings.correction_chunk_size
         self._overlap = settings.correction_overlap
         self._max_concurrency = settings.correction_max_concurrency
+        self._min_correction_chars = settings.min_correction_chars
+        self._segment_batch_size = settings.segment_batch_size
+        self._transcript_schema = (
+            TRANSCRIPT_SCHEMA if settings.llm_structured_output else None
+        )
+        # 实例级信号量：所有任务共享同一并发上限，避免多任务并行时并发数成倍放大
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        # 单次调用内同时存在的 task 上限：保持信号量满载，又不按转写长度线性膨胀
+        self._task_window = self._max_concurrency * 2
         self._num_ctx = settings.ollama_num_ctx_correction
+        # 批量纠错始终有输出上限：未配置全局上限时沿用 4096
+        self._max_output_tokens = settings.llm_max_output_tokens or 4096
         self._text_corrector = text_corrector
         self._hotword_replacer = hotword_replacer
+        self._cache = (
+            _CorrectionCache(settings.correction_cache_size)
+            if settings.correction_cache_enabled
+            else None
+        )
+
+    def _cache_key(self, system_prompt: str, user_input: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self._model, str(self._temperature), system_prompt, user_input):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.digest()
+
+    async def _map_with_progress(
+        self,
+        worker: Callable[[_T], Awaitable[_R]],
+        items: Sequence[_T],
+        label: str,
+        on_progress: ProgressCallback | None,
+    ) -> list[_R]:
+        """在实例信号量下并发执行 worker，每完成一项回报进度，结果保持输入顺序。"""
+        total = len(items)
+        completed = 0
+
+        async def _process(index: int, item: _T) -> _R:
+            nonlocal completed
+            async with self._semaphore:
+                logger.info("Correcting %s %d/%d ...", label, index + 1, total)
+                result = await worker(item)
+                # 事件循环单线程，计数与回调之间没有 await，无需加锁
+                completed += 1
+                if on_progress:
+                    on_progress(completed, total)
+                return result
+
+        return await _bounded_gather(_process, items, self._task_window)
 
     async def correct(
         self, raw_text: str, on_progress: ProgressCallback | None = None
@@ -181,54 +347,59 @@ class CorrectorService:
             return raw_text
 
         chunks = chunk_text(raw_text, self._chunk_size, self._overlap)
-        total = len(chunks)
-        semaphore = asyncio.Semaphore(self._max_concurrency)
-        completed = 0
-        lock = asyncio.Lock()
-
-        async def _process(index: int, chunk: str) -> str:
-            nonlocal completed
-            async with semaphore:
-                logger.info("Correcting chunk %d/%d ...", index + 1, total)
-                result = await self._correct_chunk(chunk)
-                async with lock:
-                    completed += 1
-                    if on_progress:
-                        on_progress(completed, total)
-                return result
-
-        tasks = [_process(i, chunk) for i, chunk in enumerate(chunks)]
-        corrected_chunks = await asyncio.gather(*tasks)
+        corrected_chunks = await self._map_with_progress(
+            self._correct_chunk, chunks, "chunk", on_progress
+        )
 
-        return merge_chunks(list(corrected_chunks), self._overlap)
+        return merge_chunks(corrected_chunks, self._overlap)
 
     async def correct_segments(
         self,
         segments_text: list[str],
         on_progress: ProgressCallback | None = None,
     ) -> list[str]:
-        """Correct a list of segment texts concurrently (no overlap merging)."""
+        """Correct a list of segment texts, packing many segments into each LLM call.
+
+        复用 transcript 的 JSON 批量协议（但使用校对提示词 SEGMENT_SYSTEM_PROMPT）：
+        N 个片段按 id 打包为一次请求，
+        受 batch_size 与 chunk_size 字符预算双重约束。相同文本只送一次，
+        结果按原顺序回填；过短的片段直接原样返回。
+        """
         if not segments_text:
             return []
 
-        total = len(segments_text)
-        semaphore = asyncio.Semaphore(self._max_concurrency)
-        completed = 0
-        lock = asyncio.Lock()
+        # dict 保持首次出现顺序，天然完成去重
+        unique_texts = [
+            t
+            for t in dict.fromkeys(segments_text)
+            if len(t.strip()) >= self._min_correction_chars
+        ]
+        entries = [{"id": i, "text": t} for i, t in enumerate(unique_texts)]
+        batches = self._create_transcript_batches(
+            entries, self._segment_batch_size, self._chunk_size
+        )
+        batch_results = await self._map_with_progress(
+            functools.partial(
+                self._correct_transcript_batch, system_prompt=SEGMENT_SYSTEM_PROMPT
+            ),
+            batches,
+            "segment batch",
+            on_progress,
+        )
 
-        async def _process(index: int, text: str) -> str:
-            nonlocal completed
-            async with semaphore:
-                logger.info("Correcting segment %d/%d ...", index + 1, total)
-                result = await self._correct_chunk(text)
-                async with lock:
-                    completed += 1
-                    if on_progress:
-                        on_progress(completed, total)
-                return result
+        corrected: dict[str, str] = {}
+        for batch, batch_result in zip(batches, batch_results):
+            # 只认本批次内的 id，LLM 臆造的 id 直接忽略
+            for item in batch:
+                corrected[item["text"]] = batch_result.get(item["id"], item["text"])
 
-        tasks = [_process(i, text) for i, text in enumerate(segments_text)]
-        return list(await asyncio.gather(*tasks))
+        logger.info(
+            "Segment correction: %d segments -> %d unique -> %d LLM calls",
+            len(segments_text),
+            len(unique_texts),
+            len(batches),
+        )
+        return [corrected.get(t, t) for t in segments_text]
 
     async def correct_transcript(
         self,
@@ -304,25 +475,9 @@ class CorrectorService:
             "Phase 4 (LLM): %d entries -> %d batches (max_entries=%d, max_chars=%d)",
             len(preprocessed_entries), total, batch_size, self._chunk_size
         )
-        semaphore = asyncio.Semaphore(self._max_concurrency)
-        completed = 0
-        lock = asyncio.Lock()
-
-        async def _process_batch(
-            index: int, batch: list[dict]
-        ) -> dict[int, str]:
-            nonlocal completed
-            async with semaphore:
-                logger.info("Correcting transcript batch %d/%d ...", index + 1, total)
-                result = await self._correct_transcript_batch(batch)
-                async with lock:
-                    completed += 1
-                    if on_progress:
-                        on_progress(completed, total)
-                return result
-
-        tasks = [_process_batch(i, batch) for i, batch in enumerate(batches)]
-        batch_results = await asyncio.gather(*tasks)
+        batch_results = await self._map_with_progress(
+            self._correct_transcript_batch, batches, "transcript batch", on_progress
+        )
 
         merged: dict[int, str] = {}
         for batch_result in batch_results:
@@ -332,6 +487,12 @@ class CorrectorService:
         for entry_id in filtered_ids:
             merged[entry_id] = ""
 
+        if self._cache is not None:
+            logger.info(
+                "Correction cache: %d hits / %d lookups (lifetime)",
+                self._cache.hits,
+                self._cache.hits + self._cache.misses,
+            )
         return merged
 
     @staticmethod
@@ -386,14 +547,23 @@ class CorrectorService:
 
         return batches
 
-    async def _correct_transcript_batch(self, batch: list[dict]) -> dict[int, str]:
+    async def _correct_transcript_batch(
+        self, batch: list[dict], system_prompt: str = TRANSCRIPT_SYSTEM_PROMPT
+    ) -> dict[int, str]:
         """Send a batch of transcript entries to LLM for JSON-to-JSON correction."""
         fallback = {item["id"]: item["text"] for item in batch}
         batch_chars = sum(len(item.get("text", "")) for item in batch)
         batch_ids = [item["id"] for item in batch]
 
         try:
-            input_json = json.dumps({"entries": batch}, ensure_ascii=False)
+            # orjson 原生输出 UTF-8 紧凑 JSON，比 json.dumps(ensure_ascii=False) 快且省 token
+            input_json = orjson.dumps({"entries": batch}).decode()
+            cache_key = None
+            if self._cache is not None:
+                cache_key = self._cache_key(system_prompt, input_json)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return dict(cached)
             logger.debug(
                 "Batch ids=%s, entries=%d, chars=%d",
                 batch_ids[:3] if len(batch_ids) > 3 else batch_ids,
@@ -403,26 +573,26 @@ class CorrectorService:
             # 使用 num_predict 限制输出长度，并显式禁用 thinking
             # 公式：输入字符 * 2（中文token转换）+ 1024（JSON 格式开销）
             # 禁用 thinking 后输出更简洁，不需要大缓冲区
-            max_output_tokens = min(4096, batch_chars * 2 + 1024)
+            max_output_tokens = min(self._max_output_tokens, batch_chars * 2 + 1024)
 
             response = await self._client.chat(
                 messages=[
-                    {"role": "system", "content": TRANSCRIPT_SYSTEM_PROMPT},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": input_json},
                 ],
                 num_ctx=self._num_ctx,
                 json_format=True,
+                json_schema=self._transcript_schema,
                 think=False,  # 禁用 thinking 确保输出完整
                 num_predict=max_output_tokens,  # 限制输出长度
             )
-            raw = response.content
-            raw = strip_think_tags(raw).strip()
+            raw = strip_llm_wrappers(response.content)
 
             if not raw:
                 logger.warning("LLM returned empty response for transcript batch, using fallback")
                 return fallback
 
-            parsed = json.loads(raw)
+            parsed = orjson.loads(raw)
 
             # Extract entries array from wrapper object or handle bare array
             if isinstance(parsed, dict):
@@ -438,12 +608,15 @@ class CorrectorService:
                 if isinstance(item, dict) and "id" in item and "text" in item:
                     result[item["id"]] = item["text"]
 
+            # 仅当批内每个 id 都由 LLM 返回时才缓存；缺失条目回填原文后不可缓存，否则永不重试
+            if cache_key is not None and fallback.keys() <= result.keys():
+                self._cache.put(cache_key, dict(result))
+
             for entry_id, original_text in fallback.items():
                 if entry_id not in result:
                     result[entry_id] = original_text
-
             return result
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(
                 "LLM transcript JSON parse failed, trying regex fallback: %s", e
             )
@@ -464,11 +637,8 @@ class CorrectorService:
         raw: str, fallback: dict[int, str]
     ) -> dict[int, str]:
         """Last-resort extraction: find id/text pairs via regex when JSON parse fails."""
-        pattern = re.compile(
-            r'"id"\s*:\s*(\d+)\s*,\s*"text"\s*:\s*"((?:[^"\\]|\\.)*)"'
-        )
         result: dict[int, str] = {}
-        for m in pattern.finditer(raw):
+        for m in _ENTRY_PAIR_RE.finditer(raw):
             entry_id = int(m.group(1))
             text = m.group(2).replace('\\"', '"').replace("\\n", "\n")
             result[entry_id] = text
@@ -485,16 +655,27 @@ class CorrectorService:
 
     async def _correct_chunk(self, text: str) -> str:
         """Send a single chunk to the LLM for correction."""
+        user_content = f"待修正文本：\n{text}"
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(SYSTEM_PROMPT, user_content)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
         try:
             response = await self._client.chat(
                 messages=[
                     {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": f"待修正文本：\n{text}"},
+                    {"role": "user", "content": user_content},
                 ],
                 num_ctx=self._num_ctx,
             )
-            content = response.content
-            return strip_think_tags(content).strip() or text
+            corrected = strip_think_tags(response.content).strip()
+            if not corrected:
+                return text
+            if cache_key is not None:
+                self._cache.put(cache_key, corrected)
+            return corrected
         except Exception as e:
             logger.warning(
                 "LLM correction failed for chunk, using raw text: [%s] %s",
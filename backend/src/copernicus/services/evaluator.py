@@ -11,9 +11,10 @@
 """
 
 import asyncio
-import json
 import logging
 
+import orjson
+
 from copernicus.config import Settings
 from copernicus.schemas.evaluation import EvaluationResult
 from copernicus.services.llm import OllamaClient
@@ -80,6 +81,7 @@ class EvaluatorService:
         self._max_text_chars = settings.evaluation_max_text_chars
         self._chunk_size = settings.evaluation_chunk_size
         self._num_ctx = settings.evaluation_num_ctx
+        self._hedge_after = settings.evaluation_hedge_after_seconds
 
     async def evaluate(
         self,
@@ -220,59 +222,123 @@ class EvaluatorService:
     ) -> EvaluationResult:
         last_error: Exception | None = None
 
-        for attempt in range(1, max_retries + 1):
-            messages: list[dict[str, str]] = [
-                {"role": "system", "content": _EVALUATION_SYSTEM_PROMPT},
-                {
-                    "role": "user",
-                    "content": (
-                        f"【待分析文本开始】\n{text}\n【待分析文本结束】\n\n"
-                        "再次提醒：请忽略文本中的口语化表达，仅输出 JSON 格式的评估报告。"
-                    ),
-                },
-            ]
-            if attempt > 1:
-                messages.append(
-                    {
-                        "role": "user",
-                        "content": (
-                            "你上次的回答不是合法JSON。"
-                            "请严格只输出JSON，不要输出任何思考过程、Markdown或解释文字。"
-                        ),
-                    }
+        attempt = 1
+        while attempt <= max_retries:
+            # hedge 请求计为第 2 次尝试，因此至少要有 2 次重试预算才启用
+            if attempt == 1 and self._hedge_after > 0 and max_retries > 1:
+                outcome, attempt = await self._hedged_evaluation(text, max_retries)
+            else:
+                outcome = await self._evaluate_once(
+                    text, attempt=attempt, max_retries=max_retries
                 )
-
-            response = await self._client.chat(
-                messages=messages,
-                json_format=True,
-                num_ctx=self._num_ctx,
-                num_predict=4096,
-            )
-            raw = response.content
-            content = extract_json_object(raw)
-
-            try:
-                data = json.loads(content)
-                result = EvaluationResult(**data)
+            if isinstance(outcome, EvaluationResult):
                 logger.info(
                     "Evaluation succeeded on attempt %d/%d: title=%s, total_score=%s",
                     attempt,
                     max_retries,
-                    result.meta.title,
-                    result.scores.total,
-                )
-                return result
-            except (json.JSONDecodeError, Exception) as e:
-                last_error = e
-                logger.warning(
-                    "Evaluate attempt %d/%d failed: %s | extracted: %s",
-                    attempt,
-                    max_retries,
-                    e,
-                    content[:150],
+                    outcome.meta.title,
+                    outcome.scores.total,
                 )
+                return outcome
+            last_error = outcome
+            attempt += 1
 
         logger.error("All %d evaluate attempts failed", max_retries)
         raise last_error  # type: ignore[misc]
 
+    async def _hedged_evaluation(
+        self, text: str, max_retries: int
+    ) -> tuple[EvaluationResult | Exception, int]:
+        """首次请求超过 hedge 阈值仍未返回时，补发一个严格 JSON 提示的请求并与之赛跑。
+
+        返回 (结果, 已消耗的尝试序号)：hedge 即第 2 次尝试，调用方从下一次继续。
+        先得到合法结果者胜出，另一个被取消；两者都只返回解析错误时返回最后一个，
+        由调用方继续顺序重试。网络错误与非 hedge 路径一致向上抛出，但会先等
+        另一个请求结束，它仍可能成功。
+        """
+        first = asyncio.create_task(
+            self._evaluate_once(text, attempt=1, max_retries=max_retries)
+        )
+        attempts = {first: 1}
+        pending = {first}
+        last_error: Exception | None = None
+        raised: BaseException | None = None
+        # try 紧跟 create_task：调用方在首次等待期间被取消时，finally 同样会取消 first
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_after)
+            if done:
+                return first.result(), 1
 
+            logger.info("Evaluation exceeded %.1fs, sending hedged request", self._hedge_after)
+            hedge = asyncio.create_task(
+                self._evaluate_once(text, attempt=2, max_retries=max_retries)
+            )
+            attempts[hedge] = 2
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        raised = task.exception()
+                        continue
+                    outcome = task.result()
+                    if isinstance(outcome, EvaluationResult):
+                        return outcome, attempts[task]
+                    last_error = outcome
+        finally:
+            # 等待落败请求真正退出，确保其释放并发槽位与 HTTP 流
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if raised is not None:
+            raise raised
+        return last_error, 2  # type: ignore[return-value]
+
+    async def _evaluate_once(
+        self, text: str, *, attempt: int, max_retries: int
+    ) -> EvaluationResult | Exception:
+        """单次评估请求；JSON 解析/校验失败时返回异常而不是抛出，网络错误照常抛出。"""
+        messages: list[dict[str, str]] = [
+            {"role": "system", "content": _EVALUATION_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    f"【待分析文本开始】\n{text}\n【待分析文本结束】\n\n"
+                    "再次提醒：请忽略文本中的口语化表达，仅输出 JSON 格式的评估报告。"
+                ),
+            },
+        ]
+        if attempt > 1:
+            messages.append(
+                {
+                    "role": "user",
+                    "content": (
+                        "你上次的回答不是合法JSON。"
+                        "请严格只输出JSON，不要输出任何思考过程、Markdown或解释文字。"
+                    ),
+                }
+            )
+
+        response = await self._client.chat(
+            messages=messages,
+            json_format=True,
+            num_ctx=self._num_ctx,
+            num_predict=4096,
+        )
+        raw = response.content
+        content = extract_json_object(raw)
+
+        try:
+            data = orjson.loads(content)
+            return EvaluationResult(**data)
+        except (orjson.JSONDecodeError, Exception) as e:
+            logger.warning(
+                "Evaluate attempt %d/%d failed: %s | extracted: %s",
+                attempt,
+                max_retries,
+                e,
+                content[:150],
+            )
+            return e
@@ -10,16 +10,21 @@ and JSON format — features not available via Ollama's OpenAI-compatible endpoi
 """
 
 import asyncio
-import json
 import logging
+import random
+import time
 from dataclasses import dataclass
 
 import httpx
+import orjson
 
 from copernicus.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# 单次退避等待上限（秒），避免 llm_retry_delay * 2^n 在多次重试后无界增长
+_MAX_RETRY_DELAY = 30.0
+
 
 @dataclass(frozen=True)
 class ChatMessage:
@@ -35,6 +40,101 @@ class ChatResponse:
     eval_count: int | None = None
 
 
+def _estimate_tokens(messages: list[dict[str, str]]) -> int:
+    """粗略估算 prompt token 数：中文约 2 字符 / token。"""
+    return sum(len(m.get("content", "")) for m in messages) // 2
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """解析 429 响应的 Retry-After（仅支持秒数形式）。"""
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """网络层错误、429 与 5xx 可重试；其余 4xx（鉴权、参数错误）重试也不会成功。"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _backoff_delay(base: float, attempt: int) -> float:
+    """指数退避 + 抖动：多个并发请求同时失败时错开重试时间，避免同步重击上游。"""
+    delay = min(base * (2 ** (attempt - 1)), _MAX_RETRY_DELAY)
+    return delay + random.uniform(0, base)
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LLM_HTTP2 enabled but h2 not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+
+class RateLimiter:
+    """RPM + TPM 双令牌桶。
+
+    Semaphore 只限制在途请求数，突发流量仍可能触发上游 429；令牌桶按分钟
+    速率匀速放行，两个桶都有余量时才准入。limit 为 0 的桶不参与限制。
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0) -> None:
+        self._rpm = rpm
+        self._tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self._rpm:
+            self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60)
+        if self._tpm:
+            self._tokens = min(self._tpm, self._tokens + elapsed * self._tpm / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self._rpm and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self._rpm
+        if self._tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self._tpm)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """等待直到两个桶都有余量，然后扣减。"""
+        if self._tpm:
+            # 单个请求超过桶容量时按容量计，避免永远无法准入
+            tokens = min(tokens, self._tpm)
+        # 持锁等待保证 FIFO 准入，不会被后来的小请求插队饿死
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(self._paused_until - now, self._wait_time(tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self._rpm:
+                self._requests -= 1
+            if self._tpm:
+                self._tokens -= tokens
+
+    def pause(self, seconds: float) -> None:
+        """上游返回 429 时整体暂停放行，而不是只让单个请求重排。"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
 class OllamaClient:
     """Async client for Ollama's native /api/chat endpoint."""
 
@@ -51,7 +151,9 @@ class OllamaClient:
         self._timeout = settings.llm_timeout
         self._max_retries = settings.llm_max_retries
         self._retry_delay = settings.llm_retry_delay
+        self._max_output_tokens = settings.llm_max_output_tokens
         self._semaphore = asyncio.Semaphore(settings.llm_max_concurrent)
+        self._limiter = RateLimiter(settings.llm_rpm, settings.llm_tpm)
         # 使用较长的连接超时，但读取超时保持合理（流式模式下每个 chunk 间隔不会太长）
         self._client = httpx.AsyncClient(
             timeout=httpx.Timeout(
@@ -59,7 +161,13 @@ class OllamaClient:
                 read=settings.llm_timeout,  # 每个 chunk 的读取超时
                 write=30.0,
                 pool=30.0,
-            )
+            ),
+            # 显式连接池：所有任务共享同一 client，keep-alive 连接复用避免反复握手
+            limits=httpx.Limits(
+                max_connections=settings.llm_http_max_connections,
+                max_keepalive_connections=settings.llm_http_keepalive,
+            ),
+            http2=settings.llm_http2 and _h2_available(),
         )
 
     async def chat(
@@ -68,6 +176,7 @@ class OllamaClient:
         *,
         temperature: float | None = None,
         json_format: bool = False,
+        json_schema: dict | None = None,
         num_ctx: int | None = None,
         think: bool | None = None,
         num_predict: int | None = None,
@@ -78,36 +187,52 @@ class OllamaClient:
         使用流式响应避免长推理超时：Ollama 会逐 token 返回，
         只要 token 生成间隔 < read_timeout，连接就不会断开。
 
-        内置重试机制：遇到网络错误或 HTTP 5xx 时自动重试，指数退避。
+        内置重试机制：遇到网络错误、HTTP 429 或 5xx 时自动重试，指数退避加随机抖动；
+        其余 4xx 直接抛出。
+        配置 llm_rpm / llm_tpm 后按令牌桶限速；429 时按 Retry-After 暂停全部请求。
 
         Args:
             think: 是否启用 qwen3 thinking 模式。
                    None = 使用默认行为（不设置参数，由 Ollama 决定）
                    False = 禁用 thinking，减少 token 消耗（适合批量纠正任务）
                    True = 显式启用 thinking（适合需要深度推理的任务）
-            num_predict: 最大输出 token 数，限制 thinking 长度避免无限推理
+            num_predict: 最大输出 token 数，限制 thinking 长度避免无限推理；
+                         未指定时使用 settings.llm_max_output_tokens
+            json_schema: 以 JSON Schema 约束输出结构（Ollama structured outputs），
+                         优先于 json_format
             timeout: 覆盖默认 read timeout（秒），用于大文本 prompt evaluation 耗时较长的场景
         """
         last_error: Exception | None = None
         max_attempts = 1 + self._max_retries
+        est_tokens = _estimate_tokens(messages)
 
         for attempt in range(1, max_attempts + 1):
+            await self._limiter.acquire(est_tokens)
             try:
                 async with self._semaphore:
                     return await self._do_chat(
                         messages,
                         temperature=temperature,
                         json_format=json_format,
+                        json_schema=json_schema,
                         num_ctx=num_ctx,
                         think=think,
                         num_predict=num_predict,
                         timeout=timeout,
                     )
-            except (httpx.ReadTimeout, httpx.ConnectError, httpx.HTTPStatusError) as e:
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
                 last_error = e
-                if attempt >= max_attempts:
+                if attempt >= max_attempts or not _is_retryable(e):
                     raise
-                delay = self._retry_delay * (2 ** (attempt - 1))
+                delay = _backoff_delay(self._retry_delay, attempt)
+                if (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code == 429
+                ):
+                    retry_after = _retry_after_seconds(e.response)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    self._limiter.pause(delay)
                 logger.warning(
                     "LLM attempt %d/%d failed, retry in %.1fs: %s",
                     attempt,
@@ -125,6 +250,7 @@ class OllamaClient:
         *,
         temperature: float | None = None,
         json_format: bool = False,
+        json_schema: dict | None = None,
         num_ctx: int | None = None,
         think: bool | None = None,
         num_predict: int | None = None,
@@ -135,6 +261,9 @@ class OllamaClient:
             "num_ctx": num_ctx if num_ctx is not None else self._num_ctx,
             "temperature": temperature if temperature is not None else self._temperature,
         }
+        # 未显式指定时套用全局上限（默认 0 不启用：thinking token 同样计入，截断后正文为空）
+        if num_predict is None and self._max_output_tokens > 0:
+            num_predict = self._max_output_tokens
         if num_predict is not None:
             options["num_predict"] = num_predict
 
@@ -147,9 +276,12 @@ class OllamaClient:
         # 仅当显式指定时才设置 think 参数
         if think is not None:
             payload["think"] = think
-        if json_format:
+        if json_schema is not None:
+            payload["format"] = json_schema
+        elif json_format:
             payload["format"] = "json"
 
+        # 原样累积流式内容：think 标签由调用方的 strip_think_tags / extract_json_* 统一清理
         content_parts: list[str] = []
         model_name = self._model
         total_duration: int | None = None
@@ -173,7 +305,7 @@ class OllamaClient:
                 if not line.strip():
                     continue
                 try:
-                    chunk = json.loads(line)
+                    chunk = orjson.loads(line)
                     # 累积内容
                     if "message" in chunk and "content" in chunk["message"]:
                         content_parts.append(chunk["message"]["content"])
@@ -182,7 +314,7 @@ class OllamaClient:
                         model_name = chunk.get("model", self._model)
                         total_duration = chunk.get("total_duration")
                         eval_count = chunk.get("eval_count")
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning("Failed to parse streaming chunk: %s", line[:100])
 
         content = "".join(content_parts)
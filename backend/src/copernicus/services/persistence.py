@@ -5,11 +5,14 @@ import logging
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 class PersistenceService:
     """Manages JSON persistence under ``upload_dir/{task_id}/``."""
@@ -42,6 +45,23 @@ class PersistenceService:
             logger.warning("Failed to load %s for task %s: %s", filename, task_id, e)
             return None
 
+    def load_model(
+        self, task_id: str, filename: str, model_cls: type[ModelT]
+    ) -> ModelT | None:
+        """Parse a persisted JSON file straight into ``model_cls``.
+
+        ``model_validate_json`` 在 pydantic-core 内一次完成解析与校验，
+        省去 json.loads -> dict -> model_validate 的中间 dict。
+        """
+        path = self.task_dir(task_id) / filename
+        if not path.exists():
+            return None
+        try:
+            return model_cls.model_validate_json(path.read_bytes())
+        except (ValidationError, OSError) as e:
+            logger.warning("Failed to load %s for task %s: %s", filename, task_id, e)
+            return None
+
     def has_file(self, task_id: str, filename: str) -> bool:
         return (self._upload_dir / task_id / filename).exists()
 
@@ -7,9 +7,9 @@ Author: afu
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from copernicus.services.asr import ASRService
@@ -18,6 +18,7 @@ from copernicus.services.corrector import CorrectorService
 from copernicus.services.hotword_replacer import HotwordReplacerService
 from copernicus.services.pipeline.base import (
     PipelineContext,
+    Stage,
     TranscriptEntry,
     TranscriptResult,
 )
@@ -73,7 +74,9 @@ class PipelineService:
         self._corrector = corrector_service
         self._hotword_replacer = hotword_replacer
 
-        asr_stage = ASRTranscribeStage(asr_service, audio_service, asyncio.Lock())
+        # ASR 推理独占显存，单 worker 保证同一时刻只有一个 generate()，替代原先的 asyncio.Lock
+        self._asr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr")
+        asr_stage = ASRTranscribeStage(asr_service, audio_service, self._asr_executor)
 
         # Transcript pipeline (7 stages, video-related ones skip for audio)
         self._transcript_pipeline = PipelineOrchestrator()
@@ -85,25 +88,24 @@ class PipelineService:
         # 2. Audio -> WAV 16kHz (skipped when VideoPreprocess already set wav_path)
         self._transcript_pipeline.register(AudioPreprocessStage(audio_service))
 
-        # 3. ASR
-        self._transcript_pipeline.register(asr_stage)
+        # 3-6. 视觉分支（关键帧 / OCR / 人脸）与文本分支（ASR / 平滑 / 纠错 / 组装）
+        #      读写的 ctx 字段互不重叠，并发执行；音频文件时视觉分支全部 skip
+        visual_branch: list[Stage] = []
 
-        # 4. Video -> keyframe extraction (skipped for audio files)
+        # Video -> keyframe extraction (skipped for audio files)
         if settings and persistence:
-            self._transcript_pipeline.register(
-                KeyframeExtractStage(settings, persistence)
-            )
+            visual_branch.append(KeyframeExtractStage(settings, persistence))
 
-        # 5. OCR scan keyframes (skipped for audio files)
+        # OCR scan keyframes (skipped for audio files)
         if ocr_service and persistence:
-            self._transcript_pipeline.register(
+            visual_branch.append(
                 OCRScanStage(ocr_service, persistence, enabled=settings.ocr_enabled if settings else True)
             )
 
-        # 6. Face detection on keyframes (skipped for audio files)
+        # Face detection on keyframes (skipped for audio files)
         if face_detector and persistence and settings:
             interval_ms = int(settings.keyframe_interval_s * 1000)
-            self._transcript_pipeline.register(
+            visual_branch.append(
                 FaceDetectStage(
                     face_detector, persistence,
                     enabled=settings.face_detect_enabled,
@@ -111,12 +113,22 @@ class PipelineService:
                 )
             )
 
-        # 7-9. Text processing
-        self._transcript_pipeline.register(SpeakerSmoothStage(pre_merge_gap_ms))
-        self._transcript_pipeline.register(
-            TextCorrectionStage(corrector_service, confidence_threshold)
-        )
-        self._transcript_pipeline.register(TranscriptBuildStage())
+        text_branch = [
+            asr_stage,
+            SpeakerSmoothStage(pre_merge_gap_ms),
+            TextCorrectionStage(corrector_service, confidence_threshold),
+            TranscriptBuildStage(),
+        ]
+
+        if visual_branch:
+            self._transcript_pipeline.register_parallel(text_branch, visual_branch)
+        else:
+            for stage in text_branch:
+                self._transcript_pipeline.register(stage)
+
+    def close(self) -> None:
+        """Release the ASR worker thread; an in-flight transcription finishes first."""
+        self._asr_executor.shutdown(wait=False, cancel_futures=True)
 
     def _merge_hotwords(self, request_hotwords: list[str] | None) -> list[str] | None:
         """Combine global hotwords (from HotwordReplacerService) with per-request hotwords."""
@@ -1,5 +1,11 @@
-"""Pipeline orchestrator: runs stages sequentially with progress reporting."""
+"""Pipeline orchestrator: runs stages sequentially with progress reporting.
 
+Stages registered via ``register_parallel`` form independent branches that
+run concurrently on the shared context (e.g. ASR + LLM correction alongside
+video keyframe/OCR/face analysis). Branches must write disjoint ctx fields.
+"""
+
+import asyncio
 import logging
 import time
 
@@ -17,45 +23,77 @@ class PipelineOrchestrator:
     """Runs a sequence of Stage instances, skipping those where should_run is False."""
 
     def __init__(self) -> None:
-        self._stages: list[Stage] = []
+        # 每一步是单个 Stage，或若干条并行分支（每条分支内部顺序执行）
+        self._steps: list[Stage | tuple[list[Stage], ...]] = []
 
     def register(self, stage: Stage) -> "PipelineOrchestrator":
-        self._stages.append(stage)
+        self._steps.append(stage)
+        return self
+
+    def register_parallel(self, *branches: list[Stage]) -> "PipelineOrchestrator":
+        """Register branches that run concurrently; each branch runs its stages in order."""
+        self._steps.append(tuple(list(b) for b in branches))
         return self
 
+    @property
+    def _stage_count(self) -> int:
+        return sum(
+            sum(len(b) for b in step) if isinstance(step, tuple) else 1
+            for step in self._steps
+        )
+
     async def run(
         self,
         ctx: PipelineContext,
         on_stage_progress: StageProgressCallback | None = None,
     ) -> PipelineContext:
-        total = len(self._stages)
+        total = self._stage_count
         executed = 0
 
-        for stage in self._stages:
+        async def _run_stage(stage: Stage) -> None:
+            nonlocal executed
             if not stage.should_run(ctx):
                 logger.debug("Stage %s skipped (should_run=False)", stage.name)
-                continue
+                return
 
             executed += 1
-            logger.info("Stage [%d/%d] %s starting...", executed, total, stage.name)
+            idx = executed
+            logger.info("Stage [%d/%d] %s starting...", idx, total, stage.name)
 
             # Build a per-stage progress callback that forwards to the outer callback
             stage_progress: ProgressCallback | None = None
             if on_stage_progress:
-                def _make_cb(name: str, idx: int) -> ProgressCallback:
+                def _make_cb(name: str, i: int) -> ProgressCallback:
                     def _cb(current: int, total_items: int) -> None:
-                        on_stage_progress(name, idx, total, current, total_items)
+                        on_stage_progress(name, i, total, current, total_items)
                     return _cb
-                stage_progress = _make_cb(stage.name, executed - 1)
+                stage_progress = _make_cb(stage.name, idx - 1)
 
             start = time.perf_counter()
-            ctx = await stage.execute(ctx, on_progress=stage_progress)
+            # 所有 stage 均原地修改 ctx；并行分支共享同一对象，写入字段互不重叠
+            await stage.execute(ctx, on_progress=stage_progress)
             elapsed = (time.perf_counter() - start) * 1000
             ctx.processing_times[stage.name] = elapsed
 
             logger.info(
                 "Stage [%d/%d] %s completed in %.0fms",
-                executed, total, stage.name, elapsed,
+                idx, total, stage.name, elapsed,
             )
 
+        async def _run_branch(branch: list[Stage]) -> None:
+            for stage in branch:
+                await _run_stage(stage)
+
+        for step in self._steps:
+            if isinstance(step, tuple):
+                # TaskGroup：任一分支失败时取消其余分支；解包首个异常，保持与串行时相同的错误信息
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        for branch in step:
+                            tg.create_task(_run_branch(branch))
+                except ExceptionGroup as eg:
+                    raise eg.exceptions[0] from eg
+            else:
+                await _run_stage(step)
+
         return ctx
@@ -1,7 +1,9 @@
-"""Stage: ASR transcription with asyncio.Lock for GPU exclusion."""
+"""Stage: ASR transcription on a dedicated single-worker executor for GPU exclusion."""
 
 import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from copernicus.services.asr import ASRService
 from copernicus.services.audio import AudioService
@@ -17,11 +19,11 @@ class ASRTranscribeStage:
         self,
         asr_service: ASRService,
         audio_service: AudioService,
-        asr_lock: asyncio.Lock,
+        asr_executor: ThreadPoolExecutor,
     ) -> None:
         self._asr = asr_service
         self._audio = audio_service
-        self._lock = asr_lock
+        self._executor = asr_executor
 
     def should_run(self, ctx: PipelineContext) -> bool:
         return ctx.wav_path is not None
@@ -36,10 +38,14 @@ class ASRTranscribeStage:
         use_ts = ctx.sentence_timestamp
         logger.info("Starting ASR transcription (sentence_timestamp=%s)...", use_ts)
         try:
-            async with self._lock:
-                asr_result = await asyncio.to_thread(
+            # 单线程专用 executor：多个任务的 ASR 在此排队串行占用 GPU，
+            # 不与 ffmpeg / 磁盘 IO 等共用默认线程池
+            asr_result = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                functools.partial(
                     self._asr.transcribe, ctx.wav_path, ctx.hotwords, use_ts
-                )
+                ),
+            )
         finally:
             self._audio.cleanup(ctx.wav_path)
 
@@ -31,11 +31,7 @@ class VideoPreprocessStage:
     name = "video_preprocess"
 
     def __init__(self, settings: Settings, persistence: PersistenceService) -> None:
-        self._video_exts = {
-            e.strip().lower()
-            for e in settings.video_extensions.split(",")
-            if e.strip()
-        }
+        self._video_exts = settings.video_extension_set
         self._audio_enhance = settings.audio_enhance
         self._persistence = persistence
 
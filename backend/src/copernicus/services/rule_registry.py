@@ -11,10 +11,9 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Literal
 
-from pypinyin import lazy_pinyin
-
 from copernicus.schemas.compliance import ComplianceRule
 
 RuleCategory = Literal[
@@ -273,12 +272,49 @@ for _r in _BUILTIN_RULES:
         _EXACT_PATTERNS[_r.id] = re.compile("|".join(re.escape(k) for k in _r.keywords))
 
 # exact 模式规则的拼音索引：{rule_id: [(keyword原文, "bao zheng shui ping"), ...]}
-_EXACT_PINYIN: dict[int, list[tuple[str, str]]] = {}
-for _r in _BUILTIN_RULES:
-    if _r.check_mode == "exact" and _r.keywords:
-        _EXACT_PINYIN[_r.id] = [
-            (kw, " ".join(lazy_pinyin(kw))) for kw in _r.keywords
-        ]
+# pypinyin 导入需加载数 MB 词典（~0.3s），推迟到首次审核时构建，不拖慢服务冷启动
+@lru_cache(maxsize=1)
+def _exact_pinyin_index() -> dict[int, list[tuple[str, str]]]:
+    from pypinyin import lazy_pinyin
+
+    return {
+        r.id: [(kw, " ".join(lazy_pinyin(kw))) for kw in r.keywords]
+        for r in _BUILTIN_RULES
+        if r.check_mode == "exact" and r.keywords
+    }
+
+
+# enrich 结果按 (id, content) 缓存：同一规则集在多次审核间反复出现，
+# StructuredRule 为 frozen dataclass 且调用方只读，可安全共享实例
+@lru_cache(maxsize=256)
+def _enrich_one(rule_id: int, content: str) -> StructuredRule:
+    builtin = RuleRegistry._match_by_content(content)
+    if builtin is not None:
+        return StructuredRule(
+            id=builtin.id,
+            title=builtin.title,
+            content=content,
+            category=builtin.category,
+            check_mode=builtin.check_mode,
+            evidence_sources=list(builtin.evidence_sources),
+            keywords=list(builtin.keywords),
+            description=builtin.description,
+            severity_default=builtin.severity_default,
+        )
+    return StructuredRule(
+        id=rule_id,
+        title=f"规则{rule_id}",
+        content=content,
+        category="behavioral",
+        check_mode="semantic",
+        evidence_sources=["transcript"],
+        description=(
+            "基于规则原文进行语义审核。"
+            "仅当文本明确违反此规则要求时才标记违规；"
+            "客观事实陈述不构成违规。"
+        ),
+        severity_default="medium",
+    )
 
 
 class RuleRegistry:
@@ -294,38 +330,7 @@ class RuleRegistry:
         这样即使 CSV 编号与内置规则不一致，也能正确映射。
         未匹配的规则 fallback 为默认 semantic 模式。
         """
-        result: list[StructuredRule] = []
-        for rule in rules:
-            builtin = self._match_by_content(rule.content)
-            if builtin is not None:
-                enriched = StructuredRule(
-                    id=builtin.id,
-                    title=builtin.title,
-                    content=rule.content,
-                    category=builtin.category,
-                    check_mode=builtin.check_mode,
-                    evidence_sources=list(builtin.evidence_sources),
-                    keywords=list(builtin.keywords),
-                    description=builtin.description,
-                    severity_default=builtin.severity_default,
-                )
-            else:
-                enriched = StructuredRule(
-                    id=rule.id,
-                    title=f"规则{rule.id}",
-                    content=rule.content,
-                    category="behavioral",
-                    check_mode="semantic",
-                    evidence_sources=["transcript"],
-                    description=(
-                        "基于规则原文进行语义审核。"
-                        "仅当文本明确违反此规则要求时才标记违规；"
-                        "客观事实陈述不构成违规。"
-                    ),
-                    severity_default="medium",
-                )
-            result.append(enriched)
-        return result
+        return [_enrich_one(rule.id, rule.content) for rule in rules]
 
     @staticmethod
     def _match_by_content(content: str) -> StructuredRule | None:
@@ -355,7 +360,7 @@ class RuleRegistry:
 
         返回 [(keyword原文, keyword拼音字符串), ...] 或 None。
         """
-        return _EXACT_PINYIN.get(rule_id)
+        return _exact_pinyin_index().get(rule_id)
 
     @staticmethod
     def group_by_source(
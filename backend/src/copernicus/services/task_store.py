@@ -3,6 +3,8 @@ import contextlib
 import logging
 import time
 import uuid
+from collections.abc import Coroutine
+from typing import Any, cast
 
 from copernicus.schemas.compliance import ComplianceResponse
 from copernicus.schemas.evaluation import EvaluationResponse
@@ -19,6 +21,20 @@ from copernicus.services.pipeline import PipelineService
 
 logger = logging.getLogger(__name__)
 
+# 各状态的进度区间 (起点, 跨度)：percent = 起点 + 跨度 * current_chunk / total_chunks
+_PROGRESS_SPAN: dict[TaskStatus, tuple[float, float]] = {
+    TaskStatus.PENDING: (0.0, 0.0),
+    TaskStatus.PROCESSING_ASR: (5.0, 0.0),
+    TaskStatus.CORRECTING: (5.0, 85.0),
+    TaskStatus.AUDITING: (0.0, 100.0),
+    TaskStatus.EVALUATING: (90.0, 10.0),
+    TaskStatus.COMPLETED: (100.0, 0.0),
+}
+# 独立评估任务没有转写阶段，评估占满 0-100
+_EVAL_ONLY_SPAN = (0.0, 100.0)
+# 视频抽帧 / 视觉扫描 / 失败等其余状态沿用纠错区间
+_DEFAULT_SPAN = (5.0, 85.0)
+
 
 class TaskInfo:
     __slots__ = (
@@ -31,6 +47,7 @@ class TaskInfo:
         "eval_only",
         "audio_path",
         "parent_task_id",
+        "finished_at",
     )
 
     def __init__(
@@ -54,42 +71,40 @@ class TaskInfo:
         self.eval_only = eval_only
         self.audio_path: str | None = None
         self.parent_task_id = parent_task_id
+        # 进入 COMPLETED/FAILED 的 monotonic 时间，TTL 淘汰依据
+        self.finished_at: float | None = None
 
     @property
     def progress(self) -> TaskProgress:
-        if self.status == TaskStatus.PENDING:
-            percent = 0.0
-        elif self.status == TaskStatus.PROCESSING_ASR:
-            percent = 5.0
-        elif self.status == TaskStatus.CORRECTING and self.total_chunks > 0:
-            percent = 5.0 + (self.current_chunk / self.total_chunks) * 85.0
-        elif self.status == TaskStatus.AUDITING:
-            if self.total_chunks > 0:
-                percent = (self.current_chunk / self.total_chunks) * 100.0
-            else:
-                percent = 0.0
-        elif self.status == TaskStatus.EVALUATING:
-            if self.eval_only:
-                if self.total_chunks > 0:
-                    percent = (self.current_chunk / self.total_chunks) * 100.0
-                else:
-                    percent = 0.0
-            else:
-                if self.total_chunks > 0:
-                    percent = 90.0 + (self.current_chunk / self.total_chunks) * 10.0
-                else:
-                    percent = 90.0
-        elif self.status == TaskStatus.COMPLETED:
-            percent = 100.0
+        if self.status == TaskStatus.EVALUATING and self.eval_only:
+            base, span = _EVAL_ONLY_SPAN
         else:
-            percent = 5.0 + (self.current_chunk / max(self.total_chunks, 1)) * 85.0
+            base, span = _PROGRESS_SPAN.get(self.status, _DEFAULT_SPAN)
+        ratio = self.current_chunk / self.total_chunks if self.total_chunks else 0.0
         return TaskProgress(
             current_chunk=self.current_chunk,
             total_chunks=self.total_chunks,
-            percent=round(percent, 1),
+            percent=round(base + span * ratio, 1),
         )
 
 
+class _ProgressSink:
+    """ProgressCallback that writes into a TaskInfo; optionally switches its status."""
+
+    __slots__ = ("task", "status")
+
+    def __init__(self, task: TaskInfo, status: TaskStatus | None = None) -> None:
+        self.task = task
+        self.status = status
+
+    def __call__(self, current: int, total: int) -> None:
+        task = self.task
+        if self.status is not None:
+            task.status = self.status
+        task.current_chunk = current
+        task.total_chunks = total
+
+
 class TaskStore:
     def __init__(
         self,
@@ -105,8 +120,18 @@ class TaskStore:
         self._persistence = persistence
         self._task_timeout = settings.task_timeout_seconds
         self._max_tasks = settings.task_max_in_memory
+        self._task_ttl = settings.task_ttl_seconds
+        self._max_workers = max(1, settings.task_max_workers)
         self._tasks: dict[str, TaskInfo] = {}
         self._hash_index: dict[str, str] = persistence.load_hash_index()
+        # 有界 worker 池：submit 只负责入队，最多 _max_workers 个任务同时运行
+        self._queue: asyncio.Queue[tuple[str, Coroutine[Any, Any, None]]] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+
+    def new_task_id(self) -> str:
+        """Allocate an ID so callers can persist inputs before submitting the task."""
+        # 无鉴权时任务 ID 即访问凭证（媒体、结果、rerun 接口），必须不可枚举
+        return uuid.uuid4().hex
 
     @property
     def persistence(self) -> PersistenceService:
@@ -143,14 +168,17 @@ class TaskStore:
             info.audio_path = entry["audio_path"]
 
             if entry["has_transcript"]:
-                data = self._persistence.load_json(task_id, "transcript.json")
-                if data:
-                    info.result = TranscriptResponse.model_validate(data)
+                transcript = self._persistence.load_model(
+                    task_id, "transcript.json", TranscriptResponse
+                )
+                if transcript is not None:
+                    info.result = transcript
                     info.status = TaskStatus.COMPLETED
 
             if info.status != TaskStatus.COMPLETED:
                 continue
 
+            info.finished_at = time.monotonic()
             self._tasks[task_id] = info
             logger.info("Restored task %s from disk", task_id)
 
@@ -171,15 +199,16 @@ class TaskStore:
         filename: str,
         hotwords: list[str] | None = None,
         *,
+        task_id: str | None = None,
         file_hash: str = "",
+        audio_path: str | None = None,
     ) -> str:
-        task_id = uuid.uuid4().hex
-        self._register_task(task_id)
-        asyncio.create_task(
-            self._run_with_timeout(
-                task_id,
-                self._run_transcript(task_id, audio_bytes, filename, hotwords),
-            )
+        # 调用方须在提交前落盘媒体：入队后 worker 随时可能启动 pipeline 读取任务目录
+        task_id = task_id or self.new_task_id()
+        self._register_task(task_id).audio_path = audio_path
+        self._enqueue(
+            task_id,
+            self._run_transcript(task_id, audio_bytes, filename, hotwords),
         )
         if file_hash:
             self._register_hash(file_hash, task_id)
@@ -195,11 +224,9 @@ class TaskStore:
         """Submit text-only evaluation (no ASR needed)."""
         if self._evaluator is None:
             raise RuntimeError("EvaluatorService not configured")
-        task_id = uuid.uuid4().hex
+        task_id = self.new_task_id()
         self._register_task(task_id, eval_only=True, parent_task_id=parent_task_id)
-        asyncio.create_task(
-            self._run_with_timeout(task_id, self._run_text_evaluation(task_id, text))
-        )
+        self._enqueue(task_id, self._run_text_evaluation(task_id, text))
         logger.info("Task %s submitted (text evaluation, parent=%s)", task_id, parent_task_id)
         return task_id
 
@@ -214,15 +241,13 @@ class TaskStore:
         """Submit compliance audit task (text-only, no ASR needed)."""
         if self._compliance is None:
             raise RuntimeError("ComplianceService not configured")
-        task_id = uuid.uuid4().hex
+        task_id = self.new_task_id()
         self._register_task(task_id, eval_only=True, parent_task_id=parent_task_id)
-        asyncio.create_task(
-            self._run_with_timeout(
-                task_id,
-                self._run_compliance_audit(
-                    task_id, transcript_entries, rules_bytes, rules_filename
-                ),
-            )
+        self._enqueue(
+            task_id,
+            self._run_compliance_audit(
+                task_id, transcript_entries, rules_bytes, rules_filename
+            ),
         )
         logger.info("Task %s submitted (compliance audit, parent=%s)", task_id, parent_task_id)
         return task_id
@@ -252,27 +277,27 @@ class TaskStore:
         task.total_chunks = 0
         task.result = None
         task.error = None
+        task.finished_at = None
 
         # invalidate downstream results
         self._persistence.delete_file(task_id, "evaluation.json")
         self._persistence.delete_file(task_id, "compliance.json")
 
-        asyncio.create_task(
-            self._run_with_timeout(
-                task_id,
-                self._run_transcript(task_id, audio_bytes, f"audio{suffix}", hotwords),
-            )
+        self._enqueue(
+            task_id,
+            self._run_transcript(task_id, audio_bytes, f"audio{suffix}", hotwords),
         )
         logger.info("Task %s rerun (transcript)", task_id)
         return task_id
 
     def rerun_evaluation(self, parent_task_id: str) -> str:
         """Re-run evaluation from existing transcript. Returns child task_id."""
-        data = self._persistence.load_json(parent_task_id, "transcript.json")
-        if data is None:
+        transcript = self._persistence.load_model(
+            parent_task_id, "transcript.json", TranscriptResponse
+        )
+        if transcript is None:
             raise ValueError(f"transcript.json not found for task {parent_task_id}")
 
-        transcript = TranscriptResponse.model_validate(data)
         full_text = "\n".join(e.text_corrected for e in transcript.transcript)
         if not full_text.strip():
             raise ValueError("Transcript text is empty")
@@ -288,10 +313,22 @@ class TaskStore:
     # -- memory management ---------------------------------------------------
 
     def _evict_completed(self) -> None:
-        """Remove oldest completed/failed tasks when memory limit is exceeded."""
+        """Drop completed/failed tasks past their TTL, then the oldest ones over the memory limit."""
+        terminal = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+        if self._task_ttl > 0:
+            cutoff = time.monotonic() - self._task_ttl
+            expired = [
+                tid
+                for tid, t in self._tasks.items()
+                if t.finished_at is not None and t.finished_at < cutoff
+            ]
+            for tid in expired:
+                del self._tasks[tid]
+            if expired:
+                logger.info("Evicted %d expired tasks (total: %d)", len(expired), len(self._tasks))
+
         if len(self._tasks) <= self._max_tasks:
             return
-        terminal = (TaskStatus.COMPLETED, TaskStatus.FAILED)
         evict_ids = [
             tid
             for tid, t in self._tasks.items()
@@ -304,6 +341,42 @@ class TaskStore:
         if to_remove > 0:
             logger.info("Evicted %d completed tasks (total: %d)", min(to_remove, len(evict_ids)), len(self._tasks))
 
+    # -- worker pool ---------------------------------------------------------
+
+    def start(self) -> None:
+        """Spawn the background workers; call once inside the running event loop."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"task-worker-{i}")
+            for i in range(self._max_workers)
+        ]
+        logger.info("TaskStore started with %d workers", self._max_workers)
+
+    async def stop(self) -> None:
+        """Cancel workers and discard tasks still waiting in the queue."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            _, coro = self._queue.get_nowait()
+            coro.close()
+
+    def _enqueue(self, task_id: str, coro: Coroutine[Any, Any, None]) -> None:
+        self._queue.put_nowait((task_id, coro))
+
+    async def _worker(self) -> None:
+        while True:
+            task_id, coro = await self._queue.get()
+            try:
+                await self._run_with_timeout(task_id, coro)
+            except Exception:
+                logger.exception("Worker crashed while running task %s", task_id)
+            finally:
+                self._queue.task_done()
+                self._evict_completed()
+
     # -- timeout wrapper -----------------------------------------------------
 
     async def _run_with_timeout(self, task_id: str, coro) -> None:
@@ -315,6 +388,7 @@ class TaskStore:
             if task and task.status not in (TaskStatus.COMPLETED, TaskStatus.FAILED):
                 task.status = TaskStatus.FAILED
                 task.error = f"任务超时（{self._task_timeout}s）"
+                task.finished_at = time.monotonic()
                 logger.error("Task %s timed out after %ds", task_id, self._task_timeout)
 
     # -- run implementations -------------------------------------------------
@@ -326,10 +400,12 @@ class TaskStore:
         try:
             yield task
             task.status = TaskStatus.COMPLETED
+            task.finished_at = time.monotonic()
             logger.info("Task %s completed (%s)", task_id, label)
         except Exception as e:
             task.status = TaskStatus.FAILED
             task.error = str(e) or type(e).__name__
+            task.finished_at = time.monotonic()
             logger.error(
                 "Task %s failed: [%s] %s", task_id, type(e).__name__, e, exc_info=True
             )
@@ -339,15 +415,11 @@ class TaskStore:
             task.status = TaskStatus.EVALUATING
             task.current_chunk = 0
             task.total_chunks = 0
-            if self._evaluator is None:
-                raise RuntimeError("EvaluatorService not configured")
-
-            def on_eval_progress(current: int, total: int) -> None:
-                task.current_chunk = current
-                task.total_chunks = total
+            # submit_text_evaluation 已校验 evaluator 存在，这里只做类型收窄
+            evaluator = cast(EvaluatorService, self._evaluator)
 
-            evaluation = await self._evaluator.evaluate(
-                text, on_progress=on_eval_progress
+            evaluation = await evaluator.evaluate(
+                text, on_progress=_ProgressSink(task)
             )
 
             task.result = EvaluationResponse(
@@ -372,19 +444,16 @@ class TaskStore:
         async with self._task_lifecycle(task_id, "transcript") as task:
             task.status = TaskStatus.PROCESSING_ASR
 
-            def on_progress(current: int, total: int) -> None:
-                task.status = TaskStatus.CORRECTING
-                task.current_chunk = current
-                task.total_chunks = total
-
             result = await self._pipeline.process_transcript(
-                audio_bytes, filename, hotwords, on_progress=on_progress,
+                audio_bytes, filename, hotwords,
+                on_progress=_ProgressSink(task, TaskStatus.CORRECTING),
                 task_id=task_id,
             )
 
-            transcript_response = TranscriptResponse(
+            # 条目来自 pipeline 内部的 TranscriptEntry，字段类型已确定，跳过逐条校验
+            transcript_response = TranscriptResponse.model_construct(
                 transcript=[
-                    TranscriptEntrySchema(
+                    TranscriptEntrySchema.model_construct(
                         timestamp=entry.timestamp,
                         timestamp_ms=entry.timestamp_ms,
                         end_ms=entry.end_ms,
@@ -410,11 +479,11 @@ class TaskStore:
             task.status = TaskStatus.AUDITING
             task.current_chunk = 0
             task.total_chunks = 0
-            if self._compliance is None:
-                raise RuntimeError("ComplianceService not configured")
+            # submit_compliance_audit 已校验 compliance 存在，这里只做类型收窄
+            compliance = cast(ComplianceService, self._compliance)
 
             start = time.perf_counter()
-            rules, few_shot_examples = self._compliance.parse_rules(
+            rules, few_shot_examples = compliance.parse_rules(
                 rules_bytes, rules_filename
             )
 
@@ -434,15 +503,11 @@ class TaskStore:
             if ve_data and isinstance(ve_data, list):
                 visual_events = ve_data
 
-            def on_audit_progress(current: int, total: int) -> None:
-                task.current_chunk = current
-                task.total_chunks = total
-
-            report = await self._compliance.audit(
+            report = await compliance.audit(
                 rules,
                 transcript_entries,
                 few_shot_examples=few_shot_examples,
-                on_progress=on_audit_progress,
+                on_progress=_ProgressSink(task),
                 ocr_results=ocr_results,
                 visual_events=visual_events,
             )
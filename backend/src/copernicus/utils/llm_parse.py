@@ -8,6 +8,9 @@ import re
 _THINK_PAIR_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
 _THINK_OPEN_RE = re.compile(r"<think>.*", re.DOTALL)
 _THINK_CLOSE_RE = re.compile(r"^.*?</think>", re.DOTALL)
+# 成对 / 未闭合 think 与 markdown 围栏的融合清理；孤立 </think> 须在其后单独处理，
+# 因为它的判定依赖成对标签先被移除（见 strip_llm_wrappers）
+_CLEAN_RE = re.compile(r"<think>.*?</think>|<think>.*|```json|```", re.DOTALL)
 
 
 def strip_think_tags(text: str) -> str:
@@ -18,10 +21,75 @@ def strip_think_tags(text: str) -> str:
     return text
 
 
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+def strip_llm_wrappers(text: str) -> str:
+    """Remove think tags and markdown fences from LLM output.
+
+    与 strip_think_tags 相同：成对与未闭合标签移除后剩下的首个 </think> 为孤立标签，
+    丢弃它及之前的全部内容。
+    """
+    text = _CLEAN_RE.sub("", text)
+    _, sep, tail = text.partition(_THINK_CLOSE)
+    return (tail if sep else text).strip()
+
+
+def _visible_spans(text: str) -> list[tuple[int, int]]:
+    """返回 think 块之外的 [start, end) 区间，语义与 strip_think_tags 一致。"""
+    pos = 0
+    spans: list[tuple[int, int]] = []
+    n = len(text)
+    while pos < n:
+        open_idx = text.find(_THINK_OPEN, pos)
+        if open_idx < 0:
+            spans.append((pos, n))
+            break
+        spans.append((pos, open_idx))
+        close = text.find(_THINK_CLOSE, open_idx + len(_THINK_OPEN))
+        if close < 0:
+            break
+        pos = close + len(_THINK_CLOSE)
+    # 可见区间内的首个 </think> 即孤立标签：丢弃它及之前的全部区间
+    for i, (a, b) in enumerate(spans):
+        close = text.find(_THINK_CLOSE, a, b)
+        if close >= 0:
+            return [(close + len(_THINK_CLOSE), b), *spans[i + 1 :]]
+    return spans
+
+
+def _slice_bracketed(text: str, open_ch: str, close_ch: str) -> str | None:
+    """在原文上按下标定位首个 open_ch 与末个 close_ch，直接切片而不先整体清洗。
+
+    推理模型的长 think 输出只做几次 find，不再复制整串；括号跨越 think 块
+    或区间内含 markdown 围栏时返回 None，由调用方回退到正则清洗路径。
+    """
+    spans = _visible_spans(text)
+    for first_span, (a, b) in enumerate(spans):
+        first = text.find(open_ch, a, b)
+        if first >= 0:
+            break
+    else:
+        return None
+    for last_span in range(len(spans) - 1, first_span - 1, -1):
+        a, b = spans[last_span]
+        last = text.rfind(close_ch, a, b)
+        if last >= 0:
+            break
+    else:
+        return None
+    if last_span != first_span or last < first or text.find("```", first, last) >= 0:
+        return None
+    return text[first : last + 1]
+
+
 def extract_json_object(text: str) -> str:
     """Extract a JSON object from LLM output, stripping think tags and markdown fences."""
-    text = strip_think_tags(text)
-    text = text.replace("```json", "").replace("```", "").strip()
+    sliced = _slice_bracketed(text, "{", "}")
+    if sliced is not None:
+        return sliced
+    text = strip_llm_wrappers(text)
     idx = text.find("{")
     if idx > 0:
         text = text[idx:]
@@ -33,8 +101,10 @@ def extract_json_object(text: str) -> str:
 
 def extract_json_array(text: str) -> str:
     """Extract a JSON array from LLM output, stripping think tags and markdown fences."""
-    text = strip_think_tags(text)
-    text = text.replace("```json", "").replace("```", "").strip()
+    sliced = _slice_bracketed(text, "[", "]")
+    if sliced is not None:
+        return sliced
+    text = strip_llm_wrappers(text)
     start = text.find("[")
     if start >= 0:
         end = text.rfind("]")
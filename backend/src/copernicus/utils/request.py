@@ -3,12 +3,34 @@
 Author: afu
 """
 
-import json
+from functools import lru_cache
+
+import orjson
+from fastapi import UploadFile
+
+from copernicus.exceptions import UploadTooLargeError
+
+# 分块读取上传文件的块大小
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=256)
+def _parse_hotwords_cached(hotwords: str) -> tuple[str, ...]:
+    """按原始字符串缓存解析结果；返回 tuple 保证缓存值不可变。"""
+    try:
+        parsed = orjson.loads(hotwords)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"hotwords 不是合法 JSON: {e}") from e
+    if not isinstance(parsed, list) or not all(isinstance(w, str) for w in parsed):
+        raise ValueError("hotwords 必须是字符串数组，如 [\"词1\", \"词2\"]")
+    return tuple(parsed)
 
 
 def parse_hotwords(hotwords: str | None) -> list[str] | None:
     """解析请求中的 hotwords JSON 字符串
 
+    客户端通常反复提交相同的热词列表，解析结果按原始字符串缓存。
+
     Args:
         hotwords: JSON 格式的热词字符串，如 '["词1", "词2"]'
 
@@ -20,10 +42,34 @@ def parse_hotwords(hotwords: str | None) -> list[str] | None:
     """
     if not hotwords:
         return None
-    try:
-        parsed = json.loads(hotwords)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"hotwords 不是合法 JSON: {e}") from e
-    if not isinstance(parsed, list) or not all(isinstance(w, str) for w in parsed):
-        raise ValueError("hotwords 必须是字符串数组，如 [\"词1\", \"词2\"]")
-    return parsed if parsed else None
+    parsed = _parse_hotwords_cached(hotwords)
+    return list(parsed) if parsed else None
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """分块读取上传文件，超出大小限制时提前终止
+
+    multipart 解析已给出文件大小时直接判定；否则按块累计字节数，
+    一旦超限立即中止，不再把剩余内容读入内存。
+
+    Args:
+        file: 上传文件
+        max_bytes: 允许的最大字节数
+
+    Returns:
+        文件完整内容
+
+    Raises:
+        UploadTooLargeError: 文件超过 max_bytes
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"File too large: {file.size} > {max_bytes} bytes")
+
+    chunks: list[bytes] = []
+    total = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLargeError(f"File too large: exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
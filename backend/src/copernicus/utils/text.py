@@ -1,38 +1,58 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate, islice
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from copernicus.services.asr import Segment, SubSentence
 
+# 中文句末标点：split_sentences 的切分依据，chunk_text 在此基础上再加 ASCII 标点
+_CN_SENT_ENDS = "。！？；\n"
 
-def chunk_text(text: str, chunk_size: int = 800, overlap: int = 50) -> list[str]:
+# chunk_text 的句末标点（模块级常量，逐个交给 str.rfind）
+_SENT_END_CHARS = tuple(_CN_SENT_ENDS + ".!?;")
+
+# 纯 ASCII 文本不可能包含全角标点，只需扫描半角句末符与换行
+_ASCII_SENT_END_CHARS = tuple(".!?;\n")
+
+# chunk_text / merge_chunks 共用的默认重叠字符数；corrector 显式传入 settings.correction_overlap
+DEFAULT_OVERLAP = 50
+
+# split_sentences 的零宽切分点（句末标点之后），模块级预编译
+_SENT_SPLIT_RE = re.compile(rf"(?<=[{_CN_SENT_ENDS}])")
+
+
+def chunk_text(text: str, chunk_size: int = 800, overlap: int = DEFAULT_OVERLAP) -> list[str]:
     """Split text into overlapping chunks for LLM context windowing.
 
     Tries to split at sentence boundaries (punctuation) to avoid cutting
     mid-sentence. Falls back to hard split if no boundary is found.
     """
-    if len(text) <= chunk_size:
+    text_len = len(text)
+    if text_len <= chunk_size:
         return [text]
 
-    sentence_endings = {"。", "！", "？", ".", "!", "?", "；", ";", "\n"}
+    # 循环不变量提到循环外，减少解释器逐次求值
+    half = chunk_size // 2
+    delims = _ASCII_SENT_END_CHARS if text.isascii() else _SENT_END_CHARS
     chunks: list[str] = []
     start = 0
 
-    while start < len(text):
+    while start < text_len:
         end = start + chunk_size
 
-        if end >= len(text):
+        if end >= text_len:
             chunks.append(text[start:])
             break
 
-        # Look backwards from `end` for a sentence boundary
-        split_pos = end
-        for i in range(end, max(start + chunk_size // 2, start), -1):
-            if text[i] in sentence_endings:
-                split_pos = i + 1
-                break
+        # Look backwards from `end` for a sentence boundary：每个标点一次 C 层 rfind，
+        # 取最靠后的命中，替代逐字符的 Python 反向循环
+        lo = start + half + 1
+        best = max(text.rfind(ch, lo, end + 1) for ch in delims)
+        split_pos = best + 1 if best >= 0 else end
 
         chunks.append(text[start:split_pos])
         start = split_pos - overlap
@@ -40,7 +60,7 @@ def chunk_text(text: str, chunk_size: int = 800, overlap: int = 50) -> list[str]
     return chunks
 
 
-def merge_chunks(chunks: list[str], overlap: int = 50) -> str:
+def merge_chunks(chunks: Sequence[str], overlap: int = DEFAULT_OVERLAP) -> str:
     """Reassemble corrected chunks, deduplicating overlap regions.
 
     Since LLM correction may alter the overlap content, we use a simple
@@ -52,12 +72,15 @@ def merge_chunks(chunks: list[str], overlap: int = 50) -> str:
         return ""
     if len(chunks) == 1:
         return chunks[0]
+    if overlap <= 0:
+        # 无重叠时无需切片，直接整体 join
+        return "".join(chunks)
 
+    # 固定位置切片 + 一次 join，总长度预先确定，O(N)；islice 避免 chunks[1:] 整表复制
     parts = [chunks[0]]
-    for chunk in chunks[1:]:
+    for chunk in islice(chunks, 1, None):
         # Skip the overlap portion from the beginning of each subsequent chunk
-        skip = min(overlap, len(chunk))
-        parts.append(chunk[skip:])
+        parts.append(chunk[overlap:])
 
     return "".join(parts)
 
@@ -66,8 +89,9 @@ def split_sentences(text: str) -> list[str]:
     """Split text into sentences using punctuation boundaries."""
     if not text:
         return []
-    parts = re.split(r"(?<=[。！？；\n])", text)
-    sentences = [p for p in parts if p.strip()]
+    parts = _SENT_SPLIT_RE.split(text)
+    # isspace() 不分配 strip 副本；空串的 isspace() 为 False，需单独排除
+    sentences = [p for p in parts if p and not p.isspace()]
     return sentences if sentences else [text]
 
 
@@ -102,15 +126,45 @@ def pre_merge_segments(
     def _to_sub(seg: Segment) -> SubSentence:
         return SubSentence(text=seg.text, start_ms=seg.start_ms, end_ms=seg.end_ms)
 
+    def _start(seg: Segment) -> Segment:
+        # text 在 flush 时由 parts 一次 join 得到
+        return _Seg(
+            text="",
+            start_ms=seg.start_ms,
+            end_ms=seg.end_ms,
+            confidence=seg.confidence,
+            speaker=seg.speaker,
+            sub_sentences=[_to_sub(seg)],
+        )
+
+    # 快速路径：单说话人且无长停顿时全部并为一段，省去逐段分支与增量加权
+    first = segments[0]
+    if all(
+        seg.speaker == first.speaker and seg.start_ms - prev.end_ms < gap_ms
+        for prev, seg in zip(segments, islice(segments, 1, None))
+    ):
+        lengths = [len(seg.text) for seg in segments]
+        total_len = sum(lengths)
+        return [
+            _Seg(
+                text="".join([seg.text for seg in segments]),
+                start_ms=first.start_ms,
+                end_ms=segments[-1].end_ms,
+                confidence=(
+                    sum(seg.confidence * n for seg, n in zip(segments, lengths)) / total_len
+                    if total_len > 0
+                    else first.confidence
+                ),
+                speaker=first.speaker,
+                sub_sentences=[_to_sub(seg) for seg in segments],
+            )
+        ]
+
+    # 合并中的文本以片段列表累积、长度另行维护，避免 cur.text += 反复复制整段字符串
     merged: list[Segment] = []
-    cur = _Seg(
-        text=segments[0].text,
-        start_ms=segments[0].start_ms,
-        end_ms=segments[0].end_ms,
-        confidence=segments[0].confidence,
-        speaker=segments[0].speaker,
-        sub_sentences=[_to_sub(segments[0])],
-    )
+    cur = _start(segments[0])
+    parts = [segments[0].text]
+    cur_len = len(segments[0].text)
 
     for seg in segments[1:]:
         same_speaker = seg.speaker == cur.speaker
@@ -118,27 +172,24 @@ def pre_merge_segments(
 
         if same_speaker and within_gap:
             # Weighted average confidence
-            len_cur = len(cur.text)
-            len_seg = len(seg.text)
-            total_len = len_cur + len_seg
+            seg_len = len(seg.text)
+            total_len = cur_len + seg_len
             if total_len > 0:
                 cur.confidence = (
-                    cur.confidence * len_cur + seg.confidence * len_seg
+                    cur.confidence * cur_len + seg.confidence * seg_len
                 ) / total_len
-            cur.text += seg.text
+            parts.append(seg.text)
+            cur_len = total_len
             cur.end_ms = seg.end_ms
             cur.sub_sentences.append(_to_sub(seg))
         else:
+            cur.text = "".join(parts)
             merged.append(cur)
-            cur = _Seg(
-                text=seg.text,
-                start_ms=seg.start_ms,
-                end_ms=seg.end_ms,
-                confidence=seg.confidence,
-                speaker=seg.speaker,
-                sub_sentences=[_to_sub(seg)],
-            )
+            cur = _start(seg)
+            parts = [seg.text]
+            cur_len = len(seg.text)
 
+    cur.text = "".join(parts)
     merged.append(cur)
     return merged
 
@@ -156,14 +207,17 @@ def smooth_speakers(
     if len(segments) < 3:
         return segments
 
+    # 说话人抽成扁平列表后按下标比较，避免每轮三次属性读取；
+    # 修正值写回 speakers，下一轮的 prev 与原地修改版本一致
+    speakers = [s.speaker for s in segments]
     for i in range(1, len(segments) - 1):
-        prev_spk = segments[i - 1].speaker
-        curr_spk = segments[i].speaker
-        next_spk = segments[i + 1].speaker
-        duration = segments[i].end_ms - segments[i].start_ms
-
-        if curr_spk != prev_spk and prev_spk == next_spk and duration < max_duration_ms:
-            segments[i].speaker = prev_spk
+        prev_spk = speakers[i - 1]
+        if speakers[i] == prev_spk or speakers[i + 1] != prev_spk:
+            continue
+        seg = segments[i]
+        if seg.end_ms - seg.start_ms < max_duration_ms:
+            speakers[i] = prev_spk
+            seg.speaker = prev_spk
 
     return segments
 
@@ -184,21 +238,32 @@ def merge_transcript_entries(
     if not entries:
         return []
 
+    # 当前分组只记首条 entry 与文本片段列表，flush 时才生成输出 dict，
+    # 合并过程不复制 dict，也不做逐次 str +=
     merged: list[dict] = []
-    current = dict(entries[0])
+    head = entries[0]
+    cur_speaker = head["speaker"]
+    cur_ts = head["timestamp_ms"]
+    text_parts = [head["text"]]
+    corrected_parts = [head["text_corrected"]]
 
     for entry in entries[1:]:
-        same_speaker = entry["speaker"] == current["speaker"]
-        within_gap = (entry["timestamp_ms"] - current["timestamp_ms"]) < gap_threshold_ms
-
-        if same_speaker and within_gap:
-            current["text"] += entry["text"]
-            current["text_corrected"] += entry["text_corrected"]
-        else:
-            merged.append(current)
-            current = dict(entry)
-
-    merged.append(current)
+        if entry["speaker"] == cur_speaker and entry["timestamp_ms"] - cur_ts < gap_threshold_ms:
+            text_parts.append(entry["text"])
+            corrected_parts.append(entry["text_corrected"])
+            continue
+        merged.append(
+            {**head, "text": "".join(text_parts), "text_corrected": "".join(corrected_parts)}
+        )
+        head = entry
+        cur_speaker = entry["speaker"]
+        cur_ts = entry["timestamp_ms"]
+        text_parts = [entry["text"]]
+        corrected_parts = [entry["text_corrected"]]
+
+    merged.append(
+        {**head, "text": "".join(text_parts), "text_corrected": "".join(corrected_parts)}
+    )
     return merged
 
 
@@ -228,30 +293,25 @@ def split_corrected_by_sub_sentences(
             )
         ]
 
-    # Split corrected text by sentence-ending punctuation
-    fragments = split_sentences(corrected_text)
-    if not fragments:
-        fragments = [corrected_text]
-
     # Compute total time span from original sub-sentences
     total_start = sub_sentences[0].start_ms
     total_end = sub_sentences[-1].end_ms
     total_duration = max(total_end - total_start, 1)
 
-    # Proportionally allocate time by character length
-    total_chars = sum(len(f) for f in fragments)
-    if total_chars == 0:
-        total_chars = 1
+    # Split corrected text by sentence-ending punctuation; whitespace-only
+    # pieces are dropped and must not count toward the proportional total.
+    fragments = split_sentences(corrected_text)
+    total_chars = sum(map(len, fragments))
 
     result: list[SubSentence] = []
     cursor_ms = total_start
+    last = len(fragments) - 1
 
     for i, frag in enumerate(fragments):
         ratio = len(frag) / total_chars
-        duration = round(total_duration * ratio)
-        frag_start = cursor_ms
-        frag_end = cursor_ms + duration if i < len(fragments) - 1 else total_end
-        result.append(_Sub(text=frag, start_ms=frag_start, end_ms=frag_end))
+        # 最后一个片段钉到 total_end，吸收逐段取整的误差
+        frag_end = total_end if i == last else cursor_ms + round(total_duration * ratio)
+        result.append(_Sub(text=frag, start_ms=cursor_ms, end_ms=frag_end))
         cursor_ms = frag_end
 
     return result
@@ -301,20 +361,19 @@ def group_segments(segments: list[Segment], chunk_size: int = 800) -> list[list[
     if not segments:
         return []
 
+    # 长度前缀和 + 二分：每组一次 bisect 定位右边界，只做 O(组数) 次 Python 切片。
+    # 组内累计长度 <= chunk_size 的最远位置即贪心算法的切分点；单段超长时独占一组
+    prefix = list(accumulate(len(seg.text) for seg in segments))
+    n = len(segments)
     groups: list[list[Segment]] = []
-    current_group: list[Segment] = []
-    current_length = 0
-
-    for seg in segments:
-        seg_len = len(seg.text)
-        if current_group and current_length + seg_len > chunk_size:
-            groups.append(current_group)
-            current_group = []
-            current_length = 0
-        current_group.append(seg)
-        current_length += seg_len
-
-    if current_group:
-        groups.append(current_group)
+    start = 0
+    base = 0
+    while start < n:
+        end = bisect_right(prefix, base + chunk_size, start)
+        if end == start:
+            end = start + 1
+        groups.append(segments[start:end])
+        base = prefix[end - 1]
+        start = end
 
     return groups
@@ -1,24 +1,30 @@
-from unittest.mock import AsyncMock, MagicMock
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
 
 import pytest
-from fastapi.testclient import TestClient
 
-from copernicus.services.corrector import CorrectorService
-from copernicus.services.pipeline import PipelineService
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
 
 
 @pytest.fixture
-def mock_pipeline() -> MagicMock:
-    """Create a mocked PipelineService for router tests."""
-    pipeline = MagicMock(spec=PipelineService)
-    pipeline._asr = MagicMock()
-    pipeline._corrector = MagicMock(spec=CorrectorService)
-    pipeline._corrector.is_reachable = AsyncMock(return_value=True)
-    return pipeline
+def mock_pipeline() -> SimpleNamespace:
+    """Create a lightweight PipelineService stand-in for router tests.
+
+    Only the attributes the routers actually touch are provided; tests attach
+    ``process_transcript`` etc. as needed.
+    """
+    return SimpleNamespace(
+        _asr=SimpleNamespace(),
+        _corrector=SimpleNamespace(is_reachable=AsyncMock(return_value=True)),
+    )
 
 
 @pytest.fixture
-def test_app(mock_pipeline: MagicMock):
+def test_app(mock_pipeline: SimpleNamespace):
     """Create a test FastAPI app with mocked dependencies."""
     from fastapi import FastAPI
     from copernicus.routers.transcription import router as transcription_router
@@ -31,4 +37,6 @@ def test_app(mock_pipeline: MagicMock):
 
 @pytest.fixture
 def client(test_app) -> TestClient:
+    from fastapi.testclient import TestClient
+
     return TestClient(test_app)
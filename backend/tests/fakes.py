@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class FakeLLM:
+    """Hand-written stand-in for OllamaClient used by the service tests.
+
+    Replays canned responses without ``unittest.mock`` bookkeeping: a list is
+    consumed one item per call, anything else is returned on every call.
+    Exception instances are raised instead of returned.
+    """
+
+    def __init__(self, responses: Any = None) -> None:
+        self.call_count = 0
+        self.last_kwargs: dict[str, Any] = {}
+        self.reachable = True
+        self.respond(responses)
+
+    def respond(self, responses: Any) -> None:
+        if isinstance(responses, list):
+            self._iter = iter(responses)
+            self._single = None
+        else:
+            self._iter = None
+            self._single = responses
+
+    async def chat(self, *args: Any, **kwargs: Any) -> Any:
+        self.call_count += 1
+        self.last_kwargs = kwargs
+        result = next(self._iter) if self._iter is not None else self._single
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def is_reachable(self) -> bool:
+        return self.reachable
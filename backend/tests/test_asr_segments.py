@@ -0,0 +1,52 @@
+import pytest
+
+from copernicus.services.asr import ASRService
+
+
+class TestBuildSegmentsFromSentences:
+    def test_no_confidence_returns_zero(self):
+        segs = ASRService._build_segments_from_sentences(["你好。", "再见。"], [])
+        assert [s.text for s in segs] == ["你好。", "再见。"]
+        assert all(s.confidence == 0.0 for s in segs)
+
+    def test_per_sentence_average_skips_punctuation(self):
+        # "你好。" 消耗 2 个 token，"再见！" 消耗 2 个 token
+        segs = ASRService._build_segments_from_sentences(
+            ["你好。", "再见！"], [0.9, 0.7, 0.5, 0.3]
+        )
+        assert segs[0].confidence == pytest.approx(0.8)
+        assert segs[1].confidence == pytest.approx(0.4)
+
+    def test_confidence_exhausted(self):
+        """token_conf 不足时，后续句子只用剩余分数，用尽后为 0"""
+        segs = ASRService._build_segments_from_sentences(
+            ["一二三。", "四五。", "六。"], [0.6, 0.6, 0.6, 0.2]
+        )
+        assert segs[0].confidence == pytest.approx(0.6)
+        assert segs[1].confidence == pytest.approx(0.2)
+        assert segs[2].confidence == 0.0
+
+
+class TestBuildSegmentsFromSentenceInfo:
+    def test_averages_by_timestamp_count(self):
+        info = [
+            {"text": "你好", "start": 0, "end": 500, "spk": 0, "timestamp": [[0, 250], [250, 500]]},
+            {"text": "嗯", "start": 500, "end": 600, "spk": 1, "timestamp": []},
+            {"text": "再见", "start": 600, "end": 900, "spk": 1, "timestamp": [[600, 750], [750, 900]]},
+        ]
+        segs = ASRService._build_segments_from_sentence_info(info, [0.9, 0.7, 0.5, 0.3])
+
+        assert [(s.start_ms, s.end_ms, s.speaker) for s in segs] == [
+            (0, 500, 0),
+            (500, 600, 1),
+            (600, 900, 1),
+        ]
+        assert segs[0].confidence == pytest.approx(0.8)
+        assert segs[1].confidence == 0.0
+        assert segs[2].confidence == pytest.approx(0.4)
+
+    def test_no_confidence_returns_zero(self):
+        info = [{"text": "你好", "timestamp": [[0, 1]]}]
+        segs = ASRService._build_segments_from_sentence_info(info, [])
+        assert segs[0].confidence == 0.0
+        assert segs[0].speaker == -1
@@ -14,7 +14,7 @@ Author: afu
 """
 
 import json
-from unittest.mock import AsyncMock, MagicMock
+from types import MappingProxyType
 
 import pytest
 
@@ -30,6 +30,7 @@ from copernicus.services.compliance_filters import (
 )
 from copernicus.services.llm import ChatResponse
 from copernicus.services.rule_registry import RuleRegistry
+from tests.fakes import FakeLLM
 
 
 # ------------------------------------------------------------------ #
@@ -37,7 +38,7 @@ from copernicus.services.rule_registry import RuleRegistry
 # ------------------------------------------------------------------ #
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_settings() -> Settings:
     return Settings(
         llm_api_key="test-key",
@@ -51,45 +52,61 @@ def mock_settings() -> Settings:
 
 
 @pytest.fixture
-def mock_client() -> MagicMock:
-    return MagicMock()
+def mock_client() -> FakeLLM:
+    return FakeLLM()
 
 
 @pytest.fixture
-def service(mock_client: MagicMock, mock_settings: Settings) -> ComplianceService:
+def service(mock_client: FakeLLM, mock_settings: Settings) -> ComplianceService:
     return ComplianceService(mock_client, mock_settings)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def registry() -> RuleRegistry:
     return RuleRegistry()
 
 
+# 过滤器逻辑测试只需字面量对象，model_construct 跳过 Pydantic 校验
+_V_DEFAULTS = {"rule_content": "r", "reason": "r", "confidence": 0.8}
+
+
+def _violation(**kw) -> Violation:
+    return Violation.model_construct(**{**_V_DEFAULTS, **kw})
+
+
+def _rule(rule_id: int, content: str) -> ComplianceRule:
+    return ComplianceRule.model_construct(id=rule_id, content=content)
+
+
+# 只读样本数据：模块级元组 + MappingProxyType，既免去逐用例重建，也能捕获误改
+_SAMPLE_ENTRIES: tuple[MappingProxyType, ...] = (
+    MappingProxyType({
+        "timestamp": "00:30",
+        "timestamp_ms": 30000,
+        "end_ms": 45000,
+        "speaker": "讲师",
+        "text_corrected": "这款产品的投保年龄是8到65岁，保障期限为终身。",
+    }),
+    MappingProxyType({
+        "timestamp": "01:00",
+        "timestamp_ms": 60000,
+        "end_ms": 75000,
+        "speaker": "讲师",
+        "text_corrected": "我们公司去年的保费收入创历史新高，是行业第一。",
+    }),
+    MappingProxyType({
+        "timestamp": "01:30",
+        "timestamp_ms": 90000,
+        "end_ms": 105000,
+        "speaker": "讲师",
+        "text_corrected": "这个产品就像存钱一样，利息比银行高，本金绝对安全。",
+    }),
+)
+
+
 @pytest.fixture
-def sample_entries() -> list[dict]:
-    return [
-        {
-            "timestamp": "00:30",
-            "timestamp_ms": 30000,
-            "end_ms": 45000,
-            "speaker": "讲师",
-            "text_corrected": "这款产品的投保年龄是8到65岁，保障期限为终身。",
-        },
-        {
-            "timestamp": "01:00",
-            "timestamp_ms": 60000,
-            "end_ms": 75000,
-            "speaker": "讲师",
-            "text_corrected": "我们公司去年的保费收入创历史新高，是行业第一。",
-        },
-        {
-            "timestamp": "01:30",
-            "timestamp_ms": 90000,
-            "end_ms": 105000,
-            "speaker": "讲师",
-            "text_corrected": "这个产品就像存钱一样，利息比银行高，本金绝对安全。",
-        },
-    ]
+def sample_entries() -> list[MappingProxyType]:
+    return list(_SAMPLE_ENTRIES)
 
 
 # ------------------------------------------------------------------ #
@@ -97,132 +114,112 @@ def sample_entries() -> list[dict]:
 # ------------------------------------------------------------------ #
 
 
+# enrich 结果在模块导入时计算一次，参数化用例间共享
+_REGISTRY = RuleRegistry()
+_RULES_12 = _REGISTRY.enrich([ComplianceRule(id=12, content="禁止混淆概念")])
+_RULES_12_CONCEPTS = _REGISTRY.enrich([
+    ComplianceRule(id=12, content="不得使用存取、利息、本金等概念"),
+])
+_RULES_13 = _REGISTRY.enrich([
+    ComplianceRule(id=13, content="不得使用保证水平、零风险等不当用语"),
+])
+_RULES_5 = _REGISTRY.enrich([ComplianceRule(id=5, content="不得夸大收益")])
+
+
+def _v(rule_id: int, rule_content: str, reason: str, confidence: float, text: str) -> Violation:
+    return Violation(
+        rule_id=rule_id,
+        rule_content=rule_content,
+        reason=reason,
+        confidence=confidence,
+        original_text=text,
+    )
+
+
 class TestExactMatchValidator:
-    def test_drops_false_positive_without_keyword(self, registry: RuleRegistry):
-        """LLM 报告 rule_id=12 但 original_text 中无禁止关键词 -> 丢弃"""
-        rules = registry.enrich([ComplianceRule(id=12, content="禁止混淆概念")])
-        vs = [
-            Violation(
-                rule_id=12,
-                rule_content="禁止混淆概念",
-                reason="使用了投保年龄",
-                confidence=0.9,
-                original_text="投保年龄8到65岁",
+    @pytest.mark.parametrize(
+        "rules,vs,text,expected",
+        [
+            # LLM 报告 rule_id=12 但 original_text 中无禁止关键词 -> 丢弃
+            pytest.param(
+                _RULES_12,
+                [_v(12, "禁止混淆概念", "使用了投保年龄", 0.9, "投保年龄8到65岁")],
+                "投保年龄8到65岁",
+                [],
+                id="drops_false_positive_without_keyword",
             ),
-        ]
-        result = ExactMatchValidator().apply(vs, rules, "投保年龄8到65岁")
-        assert len(result) == 0
-
-    def test_keeps_true_positive_with_keyword(self, registry: RuleRegistry):
-        """original_text 中包含禁止关键词 -> 保留"""
-        rules = registry.enrich([ComplianceRule(id=12, content="禁止混淆概念")])
-        vs = [
-            Violation(
-                rule_id=12,
-                rule_content="禁止混淆概念",
-                reason="使用了本金",
-                confidence=0.9,
-                original_text="本金绝对安全",
+            # original_text 中包含禁止关键词 -> 保留
+            pytest.param(
+                _RULES_12,
+                [_v(12, "禁止混淆概念", "使用了本金", 0.9, "本金绝对安全")],
+                "本金绝对安全",
+                [{"rule_id": 12, "original_text": "本金绝对安全"}],
+                id="keeps_true_positive_with_keyword",
             ),
-        ]
-        result = ExactMatchValidator().apply(vs, rules, "本金绝对安全")
-        assert len(result) == 1
-        assert result[0].original_text == "本金绝对安全"
-
-    def test_supplements_missed_violation(self, registry: RuleRegistry):
-        """LLM 遗漏但全文中存在禁止关键词 -> 补充添加"""
-        rules = registry.enrich([ComplianceRule(id=12, content="禁止混淆概念")])
-        result = ExactMatchValidator().apply(
-            [], rules, "这个产品就像存钱一样，利息比银行高"
-        )
-        assert len(result) == 1
-        assert result[0].rule_id == 12
-        assert result[0].confidence == 1.0
-
-    def test_passthrough_non_exact_rules(self, registry: RuleRegistry):
-        """非 exact 模式的规则不受影响"""
-        rules = registry.enrich([ComplianceRule(id=5, content="不得夸大收益")])
-        vs = [
-            Violation(
-                rule_id=5,
-                rule_content="不得夸大收益",
-                reason="夸大了",
-                confidence=0.8,
-                original_text="收益很高",
+            # LLM 遗漏但全文中存在禁止关键词 -> 补充添加
+            pytest.param(
+                _RULES_12,
+                [],
+                "这个产品就像存钱一样，利息比银行高",
+                [{"rule_id": 12, "confidence": 1.0}],
+                id="supplements_missed_violation",
             ),
-        ]
-        result = ExactMatchValidator().apply(vs, rules, "收益很高")
-        assert len(result) == 1
-
-    def test_homophone_variants(self, registry: RuleRegistry):
-        """ASR 同音字"保正水平"应通过拼音回退命中 rule 13。
-
-        "保正水平"(bao zheng shui ping) 与 "保证水平" 拼音完全一致，
-        但不在 keywords 列表中，正则匹配不到，拼音回退路径应保留该违规。
-        """
-        rules = registry.enrich([
-            ComplianceRule(id=13, content="不得使用保证水平、零风险等不当用语"),
-        ])
-        vs = [
-            Violation(
-                rule_id=13,
-                rule_content="禁止不当用语",
-                reason="使用了保证水平的同音字变体",
-                confidence=0.9,
-                original_text="保正水平主要取决于保险公司实际经营成果",
+            # 非 exact 模式的规则不受影响
+            pytest.param(
+                _RULES_5,
+                [_v(5, "不得夸大收益", "夸大了", 0.8, "收益很高")],
+                "收益很高",
+                [{"rule_id": 5}],
+                id="passthrough_non_exact_rules",
             ),
-        ]
-        result = ExactMatchValidator().apply(
-            vs, rules, "保正水平主要取决于保险公司实际经营成果"
-        )
-        assert len(result) == 1
-        assert result[0].rule_id == 13
-
-    def test_homophone_supplement(self, registry: RuleRegistry):
-        """LLM 遗漏但全文含同音字"犁息" -> 拼音补充路径应添加违规"""
-        rules = registry.enrich([
-            ComplianceRule(id=12, content="不得使用存取、利息、本金等概念"),
-        ])
-        result = ExactMatchValidator().apply(
-            [], rules, "这个产品的犁息比银行高"
-        )
-        assert len(result) == 1
-        assert result[0].rule_id == 12
-
-    def test_pinyin_novel_homophone(self, registry: RuleRegistry):
-        """从未出现在 keywords 中的新同音字变体，验证拼音泛化能力。
-
-        "笨金" 是 "本金" 的同音字变体，不在 keywords 列表中，
-        但拼音匹配应能自动捕获。
-        """
-        rules = registry.enrich([
-            ComplianceRule(id=12, content="不得使用存取、利息、本金等概念"),
-        ])
-        result = ExactMatchValidator().apply(
-            [], rules, "这个产品笨金有保障"
-        )
-        assert len(result) == 1
-        assert result[0].rule_id == 12
-
-    def test_pinyin_no_false_positive(self, registry: RuleRegistry):
-        """拼音不同不应误匹配："保证质量"不应命中"保证水平"。"""
-        rules = registry.enrich([
-            ComplianceRule(id=13, content="不得使用保证水平、零风险等不当用语"),
-        ])
-        vs = [
-            Violation(
-                rule_id=13,
-                rule_content="禁止不当用语",
-                reason="疑似不当用语",
-                confidence=0.8,
-                original_text="我们保证质量是最好的",
+            # ASR 同音字"保正水平"(bao zheng shui ping) 与 "保证水平" 拼音完全一致，
+            # 但不在 keywords 列表中，正则匹配不到，拼音回退路径应保留该违规
+            pytest.param(
+                _RULES_13,
+                [
+                    _v(
+                        13, "禁止不当用语", "使用了保证水平的同音字变体", 0.9,
+                        "保正水平主要取决于保险公司实际经营成果",
+                    ),
+                ],
+                "保正水平主要取决于保险公司实际经营成果",
+                [{"rule_id": 13}],
+                id="homophone_variants",
             ),
-        ]
-        result = ExactMatchValidator().apply(
-            vs, rules, "我们保证质量是最好的"
-        )
-        # "保证质量"拼音与任何 rule 13 keyword 都不匹配，应被丢弃
-        assert len(result) == 0
+            # LLM 遗漏但全文含同音字"犁息" -> 拼音补充路径应添加违规
+            pytest.param(
+                _RULES_12_CONCEPTS,
+                [],
+                "这个产品的犁息比银行高",
+                [{"rule_id": 12}],
+                id="homophone_supplement",
+            ),
+            # "笨金" 是 "本金" 的同音字变体，不在 keywords 列表中，
+            # 但拼音匹配应能自动捕获（验证拼音泛化能力）
+            pytest.param(
+                _RULES_12_CONCEPTS,
+                [],
+                "这个产品笨金有保障",
+                [{"rule_id": 12}],
+                id="pinyin_novel_homophone",
+            ),
+            # "保证质量"拼音与任何 rule 13 keyword 都不匹配，应被丢弃
+            pytest.param(
+                _RULES_13,
+                [_v(13, "禁止不当用语", "疑似不当用语", 0.8, "我们保证质量是最好的")],
+                "我们保证质量是最好的",
+                [],
+                id="pinyin_no_false_positive",
+            ),
+        ],
+    )
+    def test_exact_match(
+        self, rules: list, vs: list[Violation], text: str, expected: list[dict]
+    ):
+        result = ExactMatchValidator().apply(vs, rules, text)
+        assert len(result) == len(expected)
+        for v, attrs in zip(result, expected):
+            assert {k: getattr(v, k) for k in attrs} == attrs
 
 
 # ------------------------------------------------------------------ #
@@ -266,19 +263,30 @@ class TestFalsePositiveRegression:
 # ------------------------------------------------------------------ #
 
 
+_CHUNK_60_90 = (
+    MappingProxyType({"timestamp_ms": 60000, "end_ms": 90000, "text_corrected": "x"}),
+)
+_OCR_RANGE = (
+    MappingProxyType({"timestamp_ms": 10000, "text": "too early"}),
+    MappingProxyType({"timestamp_ms": 55000, "text": "just in margin"}),
+    MappingProxyType({"timestamp_ms": 70000, "text": "in range"}),
+    MappingProxyType({"timestamp_ms": 200000, "text": "too late"}),
+)
+_OCR_SAME_FRAME = (
+    MappingProxyType({"timestamp_ms": 70000, "text": "same text"}),
+    MappingProxyType({"timestamp_ms": 70000, "text": "same text"}),
+    MappingProxyType({"timestamp_ms": 70000, "text": "different text"}),
+)
+_OCR_UNSORTED = (
+    MappingProxyType({"timestamp_ms": 50000, "text": "later"}),
+    MappingProxyType({"timestamp_ms": 10000, "text": "earlier"}),
+)
+
+
 class TestOCRAlignment:
     def test_filters_by_time_range(self):
         """只保留与 chunk 时间范围重叠（含 margin）的 OCR 记录"""
-        entries = [
-            {"timestamp_ms": 60000, "end_ms": 90000, "text_corrected": "x"},
-        ]
-        ocr = [
-            {"timestamp_ms": 10000, "text": "too early"},
-            {"timestamp_ms": 55000, "text": "just in margin"},
-            {"timestamp_ms": 70000, "text": "in range"},
-            {"timestamp_ms": 200000, "text": "too late"},
-        ]
-        aligned = _align_ocr_to_chunk(entries, ocr, margin_ms=5000)
+        aligned = _align_ocr_to_chunk(_CHUNK_60_90, _OCR_RANGE, margin_ms=5000)
         texts = [r["text"] for r in aligned]
         assert "just in margin" in texts
         assert "in range" in texts
@@ -287,31 +295,17 @@ class TestOCRAlignment:
 
     def test_deduplicates_same_frame_text(self):
         """同帧同文本去重"""
-        entries = [
-            {"timestamp_ms": 60000, "end_ms": 90000, "text_corrected": "x"},
-        ]
-        ocr = [
-            {"timestamp_ms": 70000, "text": "same text"},
-            {"timestamp_ms": 70000, "text": "same text"},
-            {"timestamp_ms": 70000, "text": "different text"},
-        ]
-        aligned = _align_ocr_to_chunk(entries, ocr, margin_ms=5000)
+        aligned = _align_ocr_to_chunk(_CHUNK_60_90, _OCR_SAME_FRAME, margin_ms=5000)
         assert len(aligned) == 2
 
     def test_empty_ocr_returns_empty(self):
-        entries = [{"timestamp_ms": 0, "end_ms": 1000, "text_corrected": "x"}]
+        entries = (MappingProxyType({"timestamp_ms": 0, "end_ms": 1000, "text_corrected": "x"}),)
         assert _align_ocr_to_chunk(entries, [], margin_ms=5000) == []
         assert _align_ocr_to_chunk(entries, None, margin_ms=5000) == []
 
     def test_sorted_by_timestamp(self):
-        entries = [
-            {"timestamp_ms": 0, "end_ms": 100000, "text_corrected": "x"},
-        ]
-        ocr = [
-            {"timestamp_ms": 50000, "text": "later"},
-            {"timestamp_ms": 10000, "text": "earlier"},
-        ]
-        aligned = _align_ocr_to_chunk(entries, ocr, margin_ms=5000)
+        entries = (MappingProxyType({"timestamp_ms": 0, "end_ms": 100000, "text_corrected": "x"}),)
+        aligned = _align_ocr_to_chunk(entries, _OCR_UNSORTED, margin_ms=5000)
         assert aligned[0]["text"] == "earlier"
         assert aligned[1]["text"] == "later"
 
@@ -321,24 +315,29 @@ class TestOCRAlignment:
 # ------------------------------------------------------------------ #
 
 
-class TestConfidenceFilter:
-    def test_drops_below_threshold(self):
-        vs = [
-            Violation(rule_id=1, rule_content="r", reason="r", confidence=0.3),
-            Violation(rule_id=2, rule_content="r", reason="r", confidence=0.7),
-            Violation(rule_id=3, rule_content="r", reason="r", confidence=0.95),
-        ]
-        result = ConfidenceFilter(0.7).apply(vs)
-        assert len(result) == 2
-        assert all(v.confidence >= 0.7 for v in result)
+_CONF = ConfidenceFilter(0.7)
 
-    def test_keeps_exactly_at_threshold(self):
-        vs = [Violation(rule_id=1, rule_content="r", reason="r", confidence=0.7)]
-        result = ConfidenceFilter(0.7).apply(vs)
-        assert len(result) == 1
+_CONF_CASES = [
+    pytest.param(
+        [
+            _violation(rule_id=1, confidence=0.3),
+            _violation(rule_id=2, confidence=0.7),
+            _violation(rule_id=3, confidence=0.95),
+        ],
+        [2, 3],
+        id="drops_below_threshold",
+    ),
+    pytest.param([_violation(rule_id=1, confidence=0.7)], [1], id="keeps_exactly_at_threshold"),
+    pytest.param([], [], id="empty_input"),
+]
 
-    def test_empty_input(self):
-        assert ConfidenceFilter(0.7).apply([]) == []
+
+class TestConfidenceFilter:
+    @pytest.mark.parametrize("vs,expected_ids", _CONF_CASES)
+    def test_confidence_filter(self, vs: list[Violation], expected_ids: list[int]):
+        result = _CONF.apply(vs)
+        assert [v.rule_id for v in result] == expected_ids
+        assert all(v.confidence >= 0.7 for v in result)
 
 
 # ------------------------------------------------------------------ #
@@ -346,31 +345,42 @@ class TestConfidenceFilter:
 # ------------------------------------------------------------------ #
 
 
-class TestDeduplicationFilter:
-    def test_merges_same_rule_within_window(self):
-        vs = [
-            Violation(rule_id=1, rule_content="r", reason="a", confidence=0.8, timestamp_ms=1000),
-            Violation(rule_id=1, rule_content="r", reason="b", confidence=0.9, timestamp_ms=5000),
-        ]
-        result = DeduplicationFilter(30000).apply(vs)
-        assert len(result) == 1
-        assert result[0].confidence == 0.9  # 保留更高的
+_DEDUP = DeduplicationFilter(30000)
+
+_DEDUP_CASES = [
+    # 同规则窗口内合并，保留置信度更高的
+    pytest.param(
+        [
+            _violation(rule_id=1, reason="a", confidence=0.8, timestamp_ms=1000),
+            _violation(rule_id=1, reason="b", confidence=0.9, timestamp_ms=5000),
+        ],
+        [0.9],
+        id="merges_same_rule_within_window",
+    ),
+    pytest.param(
+        [
+            _violation(rule_id=1, reason="a", confidence=0.8, timestamp_ms=1000),
+            _violation(rule_id=2, reason="b", confidence=0.8, timestamp_ms=1000),
+        ],
+        [0.8, 0.8],
+        id="keeps_different_rules",
+    ),
+    pytest.param(
+        [
+            _violation(rule_id=1, reason="a", confidence=0.8, timestamp_ms=1000),
+            _violation(rule_id=1, reason="b", confidence=0.8, timestamp_ms=50000),
+        ],
+        [0.8, 0.8],
+        id="keeps_same_rule_outside_window",
+    ),
+]
 
-    def test_keeps_different_rules(self):
-        vs = [
-            Violation(rule_id=1, rule_content="r", reason="a", confidence=0.8, timestamp_ms=1000),
-            Violation(rule_id=2, rule_content="r", reason="b", confidence=0.8, timestamp_ms=1000),
-        ]
-        result = DeduplicationFilter(30000).apply(vs)
-        assert len(result) == 2
 
-    def test_keeps_same_rule_outside_window(self):
-        vs = [
-            Violation(rule_id=1, rule_content="r", reason="a", confidence=0.8, timestamp_ms=1000),
-            Violation(rule_id=1, rule_content="r", reason="b", confidence=0.8, timestamp_ms=50000),
-        ]
-        result = DeduplicationFilter(30000).apply(vs)
-        assert len(result) == 2
+class TestDeduplicationFilter:
+    @pytest.mark.parametrize("vs,expected_confidences", _DEDUP_CASES)
+    def test_dedup_filter(self, vs: list[Violation], expected_confidences: list[float]):
+        result = _DEDUP.apply(vs)
+        assert [v.confidence for v in result] == expected_confidences
 
 
 # ------------------------------------------------------------------ #
@@ -435,32 +445,53 @@ class TestRuleGrouping:
         assert rules[1].check_mode == "exact"
         assert "保种水平" in rules[1].keywords
 
+    def test_enrich_reuses_cached_rules(self, registry: RuleRegistry):
+        """相同 (id, content) 的规则命中缓存，返回同一 StructuredRule 实例"""
+        first = registry.enrich([ComplianceRule(id=12, content="禁止混淆概念")])
+        second = RuleRegistry().enrich([ComplianceRule(id=12, content="禁止混淆概念")])
+        assert first[0] is second[0]
+        assert first is not second
+
 
 # ------------------------------------------------------------------ #
 #  7. 向后兼容测试（无 OCR）
 # ------------------------------------------------------------------ #
 
 
+_AUDIT_LLM_OUTPUT = json.dumps([{
+    "rule_id": 12,
+    "timestamp": "01:30",
+    "timestamp_ms": 90000,
+    "end_ms": 105000,
+    "speaker": "讲师",
+    "original_text": "利息比银行高，本金绝对安全",
+    "reason": "将保险与银行存款混淆，使用了禁止词汇'利息''本金'",
+    "reasoning": "第一步：规则12禁止使用存取、利息、本金等概念...",
+    "severity": "high",
+    "confidence": 0.95,
+}])
+
+
+_NO_OCR_ENTRIES = (
+    MappingProxyType({
+        "timestamp": "00:30",
+        "timestamp_ms": 30000,
+        "end_ms": 45000,
+        "speaker": "讲师",
+        "text_corrected": "请您如实告知健康状况。",
+    }),
+)
+
+
 class TestBackwardCompatibility:
     @pytest.mark.asyncio
     async def test_audit_without_ocr(
-        self, service: ComplianceService, mock_client: MagicMock
+        self, service: ComplianceService, mock_client: FakeLLM
     ):
         """纯音频任务（无 OCR），audit() 行为与之前一致"""
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content="[]", model="test-model")
-        )
+        mock_client.respond(ChatResponse(content="[]", model="test-model"))
         rules = [ComplianceRule(id=1, content="如实告知")]
-        entries = [
-            {
-                "timestamp": "00:30",
-                "timestamp_ms": 30000,
-                "end_ms": 45000,
-                "speaker": "讲师",
-                "text_corrected": "请您如实告知健康状况。",
-            },
-        ]
-        report = await service.audit(rules, entries)
+        report = await service.audit(rules, list(_NO_OCR_ENTRIES))
         assert report.total_rules == 1
         assert report.violations == []
         assert report.summary == "审核完成，未发现违规内容。"
@@ -468,28 +499,14 @@ class TestBackwardCompatibility:
 
     @pytest.mark.asyncio
     async def test_audit_with_violations(
-        self, service: ComplianceService, mock_client: MagicMock
+        self, service: ComplianceService, mock_client: FakeLLM
     ):
         """LLM 返回违规时，正确解析并通过过滤器"""
-        llm_output = json.dumps([{
-            "rule_id": 12,
-            "timestamp": "01:30",
-            "timestamp_ms": 90000,
-            "end_ms": 105000,
-            "speaker": "讲师",
-            "original_text": "利息比银行高，本金绝对安全",
-            "reason": "将保险与银行存款混淆，使用了禁止词汇'利息''本金'",
-            "reasoning": "第一步：规则12禁止使用存取、利息、本金等概念...",
-            "severity": "high",
-            "confidence": 0.95,
-        }])
         # chat 被调用两次：一次 audit chunk，一次 summary
-        mock_client.chat = AsyncMock(
-            side_effect=[
-                ChatResponse(content=llm_output, model="test-model"),
-                ChatResponse(content="发现1条高风险违规。", model="test-model"),
-            ]
-        )
+        mock_client.respond([
+            ChatResponse(content=_AUDIT_LLM_OUTPUT, model="test-model"),
+            ChatResponse(content="发现1条高风险违规。", model="test-model"),
+        ])
         rules = [ComplianceRule(id=12, content="禁止混淆概念")]
         entries = [
             {
@@ -512,42 +529,45 @@ class TestBackwardCompatibility:
 # ------------------------------------------------------------------ #
 
 
+_RAW_WITH_REASONING = json.dumps([{
+    "rule_id": 9,
+    "timestamp": "01:00",
+    "timestamp_ms": 60000,
+    "end_ms": 75000,
+    "speaker": "讲师",
+    "original_text": "行业第一",
+    "reason": "使用了未经核实的排名",
+    "reasoning": "第一步：规则9禁止夸大经营成果；第二步：文本中出现'行业第一'；第三步：无数据支撑的排名声明违规",
+    "severity": "high",
+    "confidence": 0.9,
+}])
+
+_RAW_WITHOUT_REASONING = json.dumps([{
+    "rule_id": 9,
+    "timestamp": "01:00",
+    "timestamp_ms": 60000,
+    "end_ms": 75000,
+    "speaker": "讲师",
+    "original_text": "行业第一",
+    "reason": "夸大",
+    "severity": "high",
+    "confidence": 0.9,
+}])
+
+
 class TestReasoningField:
     def test_reasoning_parsed_from_llm(self):
         """LLM 输出的 reasoning 字段应透传到 Violation"""
-        raw = json.dumps([{
-            "rule_id": 9,
-            "timestamp": "01:00",
-            "timestamp_ms": 60000,
-            "end_ms": 75000,
-            "speaker": "讲师",
-            "original_text": "行业第一",
-            "reason": "使用了未经核实的排名",
-            "reasoning": "第一步：规则9禁止夸大经营成果；第二步：文本中出现'行业第一'；第三步：无数据支撑的排名声明违规",
-            "severity": "high",
-            "confidence": 0.9,
-        }])
         rules = [ComplianceRule(id=9, content="不得夸大经营成果")]
-        violations = _parse_violations(raw, rules)
+        violations = _parse_violations(_RAW_WITH_REASONING, rules)
         assert len(violations) == 1
         assert violations[0].reasoning is not None
         assert "行业第一" in violations[0].reasoning
 
     def test_reasoning_none_when_absent(self):
         """LLM 未输出 reasoning 时为 None"""
-        raw = json.dumps([{
-            "rule_id": 9,
-            "timestamp": "01:00",
-            "timestamp_ms": 60000,
-            "end_ms": 75000,
-            "speaker": "讲师",
-            "original_text": "行业第一",
-            "reason": "夸大",
-            "severity": "high",
-            "confidence": 0.9,
-        }])
         rules = [ComplianceRule(id=9, content="不得夸大经营成果")]
-        violations = _parse_violations(raw, rules)
+        violations = _parse_violations(_RAW_WITHOUT_REASONING, rules)
         assert violations[0].reasoning is None
 
 
@@ -560,24 +580,24 @@ class TestRunFilters:
     def test_full_pipeline(self, registry: RuleRegistry):
         """过滤器链：置信度过滤 -> 精确匹配验证 -> 去重 -> 证据填充"""
         rules = registry.enrich([
-            ComplianceRule(id=9, content="不得夸大经营成果"),
-            ComplianceRule(id=12, content="禁止混淆概念"),
+            _rule(9, "不得夸大经营成果"),
+            _rule(12, "禁止混淆概念"),
         ])
         violations = [
             # 低置信度 -> 应被过滤
-            Violation(
+            _violation(
                 rule_id=9, rule_content="不得夸大", reason="疑似",
                 confidence=0.4, timestamp_ms=60000,
                 original_text="收入创新高",
             ),
             # 高置信度 + exact rule 但无关键词 -> 应被 ExactMatchValidator 丢弃
-            Violation(
+            _violation(
                 rule_id=12, rule_content="禁止混淆", reason="误报",
                 confidence=0.9, timestamp_ms=30000,
                 original_text="投保年龄8到65岁",
             ),
             # 高置信度 + 有关键词 -> 应保留
-            Violation(
+            _violation(
                 rule_id=12, rule_content="禁止混淆", reason="含有本金",
                 confidence=0.95, timestamp_ms=90000,
                 original_text="本金绝对安全",
@@ -601,25 +621,22 @@ class TestRunFilters:
 # ------------------------------------------------------------------ #
 
 
+_OCR_FRAMES = (
+    MappingProxyType({"timestamp_ms": 55000, "text": "屏幕文字A", "frame_path": "/frames/001.jpg"}),
+    MappingProxyType({"timestamp_ms": 200000, "text": "太远了", "frame_path": "/frames/099.jpg"}),
+)
+
+
 class TestEvidenceEnricher:
     def test_enriches_with_nearest_ocr(self):
         vs = [
-            Violation(
-                rule_id=12, rule_content="r", reason="r",
-                confidence=0.9, timestamp_ms=60000,
-            ),
-        ]
-        ocr = [
-            {"timestamp_ms": 55000, "text": "屏幕文字A", "frame_path": "/frames/001.jpg"},
-            {"timestamp_ms": 200000, "text": "太远了", "frame_path": "/frames/099.jpg"},
+            _violation(rule_id=12, confidence=0.9, timestamp_ms=60000),
         ]
-        result = EvidenceEnricher().apply(vs, ocr)
+        result = EvidenceEnricher().apply(vs, _OCR_FRAMES)
         assert result[0].evidence_text == "屏幕文字A"
         assert result[0].evidence_url == "001.jpg"
 
     def test_no_ocr_no_change(self):
-        vs = [
-            Violation(rule_id=1, rule_content="r", reason="r", confidence=0.9),
-        ]
+        vs = [_violation(rule_id=1, confidence=0.9)]
         result = EvidenceEnricher().apply(vs, None)
         assert result[0].evidence_text is None
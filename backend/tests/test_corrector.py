@@ -1,13 +1,20 @@
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import json
 
 import pytest
 
 from copernicus.config import Settings
-from copernicus.services.corrector import CorrectorService
+from copernicus.services.corrector import (
+    SEGMENT_SYSTEM_PROMPT,
+    TRANSCRIPT_SCHEMA,
+    CorrectorService,
+    _bounded_gather,
+)
 from copernicus.services.llm import ChatResponse
+from tests.fakes import FakeLLM
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_settings() -> Settings:
     return Settings(
         llm_api_key="test-key",
@@ -21,15 +28,21 @@ def mock_settings() -> Settings:
 
 
 @pytest.fixture
-def mock_client() -> MagicMock:
-    return MagicMock()
+def mock_client() -> FakeLLM:
+    return FakeLLM()
 
 
 @pytest.fixture
-def corrector(mock_client: MagicMock, mock_settings: Settings) -> CorrectorService:
+def corrector(mock_client: FakeLLM, mock_settings: Settings) -> CorrectorService:
     return CorrectorService(mock_client, mock_settings)
 
 
+_SEGMENT_BATCH_JSON = json.dumps(
+    {"entries": [{"id": 0, "text": "纠正一"}, {"id": 1, "text": "纠正二"}]},
+    ensure_ascii=False,
+)
+
+
 class TestCorrect:
     @pytest.mark.asyncio
     async def test_empty_text_returns_as_is(self, corrector: CorrectorService):
@@ -37,35 +50,31 @@ class TestCorrect:
         assert result == "   "
 
     @pytest.mark.asyncio
-    async def test_calls_llm_and_returns_corrected(self, corrector: CorrectorService, mock_client: MagicMock):
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content="纠正后的文本", model="test-model")
-        )
+    async def test_calls_llm_and_returns_corrected(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content="纠正后的文本", model="test-model"))
 
         result = await corrector.correct("原始文本")
         assert result == "纠正后的文本"
 
     @pytest.mark.asyncio
-    async def test_fallback_on_llm_failure(self, corrector: CorrectorService, mock_client: MagicMock):
-        mock_client.chat = AsyncMock(side_effect=Exception("API error"))
+    async def test_fallback_on_llm_failure(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(Exception("API error"))
 
         result = await corrector.correct("原始文本")
         # Should fall back to raw text
         assert result == "原始文本"
 
     @pytest.mark.asyncio
-    async def test_concurrent_chunks(self, corrector: CorrectorService, mock_client: MagicMock):
+    async def test_concurrent_chunks(self, corrector: CorrectorService, mock_client: FakeLLM):
         """Verify multiple chunks are processed concurrently."""
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content="corrected", model="test-model")
-        )
+        mock_client.respond(ChatResponse(content="corrected", model="test-model"))
         corrector._chunk_size = 10
         corrector._overlap = 2
 
         text = "这是一段需要分块处理的较长文本，用来测试并发处理是否正常工作。"
         await corrector.correct(text)
 
-        assert mock_client.chat.call_count > 1
+        assert mock_client.call_count > 1
 
 
 class TestCorrectSegments:
@@ -75,23 +84,120 @@ class TestCorrectSegments:
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_corrects_each_segment(self, corrector: CorrectorService, mock_client: MagicMock):
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content="纠正文本", model="test-model")
-        )
+    async def test_packs_segments_into_one_call(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_SEGMENT_BATCH_JSON, model="test-model"))
+
+        result = await corrector.correct_segments(["段落一", "段落二"])
+        assert result == ["纠正一", "纠正二"]
+        assert mock_client.call_count == 1
+        assert mock_client.last_kwargs["json_schema"] is TRANSCRIPT_SCHEMA
+
+    @pytest.mark.asyncio
+    async def test_uses_proofreading_prompt(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_SEGMENT_BATCH_JSON, model="test-model"))
+
+        await corrector.correct_segments(["段落一", "段落二"])
+        # 片段纠错只做校对，不能套用 transcript 的润色提示词
+        assert mock_client.last_kwargs["messages"][0]["content"] == SEGMENT_SYSTEM_PROMPT
+
+    @pytest.mark.asyncio
+    async def test_dedups_and_skips_short_segments(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_SEGMENT_BATCH_JSON, model="test-model"))
+
+        result = await corrector.correct_segments(["段落一", "嗯", "段落一", "", "段落二"])
+        assert result == ["纠正一", "嗯", "纠正一", "", "纠正二"]
+        assert mock_client.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unparseable_batch_falls_back_to_raw(self, corrector: CorrectorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content="纠正文本", model="test-model"))
 
         result = await corrector.correct_segments(["段落一", "段落二"])
-        assert result == ["纠正文本", "纠正文本"]
-        assert mock_client.chat.call_count == 2
+        assert result == ["段落一", "段落二"]
+
+
+class TestCorrectionCache:
+    @pytest.mark.asyncio
+    async def test_repeated_chunk_hits_cache(self, mock_settings: Settings):
+        client = FakeLLM(ChatResponse(content="纠正文本", model="test-model"))
+        service = CorrectorService(
+            client, mock_settings.model_copy(update={"correction_cache_enabled": True})
+        )
+
+        assert await service._correct_chunk("原始文本") == "纠正文本"
+        assert await service._correct_chunk("原始文本") == "纠正文本"
+        assert client.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_not_cached(self, mock_settings: Settings):
+        client = FakeLLM([Exception("API error"), ChatResponse(content="纠正文本", model="test-model")])
+        service = CorrectorService(
+            client, mock_settings.model_copy(update={"correction_cache_enabled": True})
+        )
+
+        assert await service._correct_chunk("原始文本") == "原始文本"
+        assert await service._correct_chunk("原始文本") == "纠正文本"
+        assert client.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "reply",
+        [{"entries": []}, {"entries": [{"id": 0, "text": "纠正一"}]}],
+        ids=["empty", "partial"],
+    )
+    async def test_incomplete_batch_is_not_cached(self, mock_settings: Settings, reply: dict):
+        client = FakeLLM([
+            ChatResponse(content=json.dumps(reply, ensure_ascii=False), model="test-model"),
+            ChatResponse(content=_SEGMENT_BATCH_JSON, model="test-model"),
+        ])
+        service = CorrectorService(
+            client, mock_settings.model_copy(update={"correction_cache_enabled": True})
+        )
+        batch = [{"id": 0, "text": "段落一"}, {"id": 1, "text": "段落二"}]
+
+        first = await service._correct_transcript_batch(batch)
+        assert first[1] == "段落二"
+        assert await service._correct_transcript_batch(batch) == {0: "纠正一", 1: "纠正二"}
+        assert await service._correct_transcript_batch(batch) == {0: "纠正一", 1: "纠正二"}
+        assert client.call_count == 2
+
+
+class TestBoundedGather:
+    @pytest.mark.asyncio
+    async def test_keeps_order_and_caps_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        async def _work(i: int, item: int) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (item % 3))
+            in_flight -= 1
+            return item * 2
+
+        result = await _bounded_gather(_work, list(range(50)), limit=4)
+        assert result == [i * 2 for i in range(50)]
+        assert peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_error_propagates(self):
+        async def _work(i: int, item: int) -> int:
+            if item == 3:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            return item
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await _bounded_gather(_work, list(range(10)), limit=2)
 
 
 class TestIsReachable:
     @pytest.mark.asyncio
-    async def test_reachable(self, mock_client: MagicMock):
-        mock_client.is_reachable = AsyncMock(return_value=True)
+    async def test_reachable(self, mock_client: FakeLLM):
         assert await mock_client.is_reachable() is True
 
     @pytest.mark.asyncio
-    async def test_unreachable(self, mock_client: MagicMock):
-        mock_client.is_reachable = AsyncMock(return_value=False)
+    async def test_unreachable(self, mock_client: FakeLLM):
+        mock_client.reachable = False
         assert await mock_client.is_reachable() is False
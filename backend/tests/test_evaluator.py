@@ -1,14 +1,16 @@
+import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
 from copernicus.config import Settings
 from copernicus.services.evaluator import EvaluatorService
 from copernicus.services.llm import ChatResponse
+from tests.fakes import FakeLLM
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_settings() -> Settings:
     return Settings(
         llm_api_key="test-key",
@@ -19,12 +21,12 @@ def mock_settings() -> Settings:
 
 
 @pytest.fixture
-def mock_client() -> MagicMock:
-    return MagicMock()
+def mock_client() -> FakeLLM:
+    return FakeLLM()
 
 
 @pytest.fixture
-def evaluator(mock_client: MagicMock, mock_settings: Settings) -> EvaluatorService:
+def evaluator(mock_client: FakeLLM, mock_settings: Settings) -> EvaluatorService:
     return EvaluatorService(mock_client, mock_settings)
 
 
@@ -48,16 +50,16 @@ SAMPLE_EVALUATION_JSON = {
     "summary": "本视频分析了2025年全球经济格局。",
 }
 
+# 固定的 LLM 输出样本在导入时序列化一次，避免每个用例重复 json.dumps
+_SAMPLE_JSON_STR = json.dumps(SAMPLE_EVALUATION_JSON, ensure_ascii=False)
+_SAMPLE_JSON_FENCED = f"```json\n{_SAMPLE_JSON_STR}\n```"
+_MINIMAL_JSON_STR = json.dumps({"meta": {"title": "测试"}, "summary": "摘要"}, ensure_ascii=False)
+
 
 class TestEvaluate:
     @pytest.mark.asyncio
-    async def test_evaluate_returns_structured_result(self, evaluator: EvaluatorService, mock_client: MagicMock):
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(
-                content=json.dumps(SAMPLE_EVALUATION_JSON, ensure_ascii=False),
-                model="test-model",
-            )
-        )
+    async def test_evaluate_returns_structured_result(self, evaluator: EvaluatorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_SAMPLE_JSON_STR, model="test-model"))
 
         result = await evaluator.evaluate("测试文本")
         assert result.meta.title == "2025全球经济格局分析"
@@ -65,35 +67,107 @@ class TestEvaluate:
         assert result.analysis.sentiment == "中立"
 
     @pytest.mark.asyncio
-    async def test_evaluate_strips_markdown_fences(self, evaluator: EvaluatorService, mock_client: MagicMock):
-        wrapped = f"```json\n{json.dumps(SAMPLE_EVALUATION_JSON, ensure_ascii=False)}\n```"
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content=wrapped, model="test-model")
-        )
+    async def test_evaluate_strips_markdown_fences(self, evaluator: EvaluatorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_SAMPLE_JSON_FENCED, model="test-model"))
 
         result = await evaluator.evaluate("测试文本")
         assert result.scores.total == 87
 
     @pytest.mark.asyncio
-    async def test_evaluate_raises_on_invalid_json(self, evaluator: EvaluatorService, mock_client: MagicMock):
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(content="这不是JSON", model="test-model")
-        )
+    async def test_evaluate_raises_on_invalid_json(self, evaluator: EvaluatorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content="这不是JSON", model="test-model"))
 
         with pytest.raises(json.JSONDecodeError):
             await evaluator.evaluate("测试文本")
 
     @pytest.mark.asyncio
-    async def test_evaluate_uses_defaults_for_missing_fields(self, evaluator: EvaluatorService, mock_client: MagicMock):
-        minimal_json = {"meta": {"title": "测试"}, "summary": "摘要"}
-        mock_client.chat = AsyncMock(
-            return_value=ChatResponse(
-                content=json.dumps(minimal_json, ensure_ascii=False),
-                model="test-model",
-            )
-        )
+    async def test_evaluate_uses_defaults_for_missing_fields(self, evaluator: EvaluatorService, mock_client: FakeLLM):
+        mock_client.respond(ChatResponse(content=_MINIMAL_JSON_STR, model="test-model"))
 
         result = await evaluator.evaluate("测试文本")
         assert result.meta.title == "测试"
         assert result.scores.total == 0
         assert result.analysis.main_points == []
+
+
+class _SlowFirstLLM(FakeLLM):
+    """首个请求挂起，后续请求立即返回，用于验证 hedged 请求。"""
+
+    def __init__(self, content: str) -> None:
+        super().__init__(ChatResponse(content=content, model="test-model"))
+        self.first_cancelled = False
+
+    async def chat(self, *args, **kwargs):
+        if self.call_count == 0:
+            self.call_count += 1
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.first_cancelled = True
+                raise
+        return await super().chat(*args, **kwargs)
+
+
+class _DelayedFirstLLM(FakeLLM):
+    """首个请求延迟后才给出结果，保证 hedge 被发出且两者都能完成。"""
+
+    _delayed = False
+
+    async def chat(self, *args, **kwargs):
+        if not self._delayed:
+            self._delayed = True
+            await asyncio.sleep(0.05)
+        return await super().chat(*args, **kwargs)
+
+
+class TestHedgedEvaluation:
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_and_cancels_slow_one(self, mock_settings: Settings):
+        client = _SlowFirstLLM(_SAMPLE_JSON_STR)
+        service = EvaluatorService(
+            client,
+            mock_settings.model_copy(update={"evaluation_hedge_after_seconds": 0.01}),
+        )
+
+        result = await service.evaluate("测试文本")
+        assert result.scores.total == 87
+        assert client.call_count == 2
+        assert client.first_cancelled
+
+    @pytest.mark.asyncio
+    async def test_caller_cancel_before_hedge_cancels_first(self, mock_settings: Settings):
+        client = _SlowFirstLLM(_SAMPLE_JSON_STR)
+        service = EvaluatorService(
+            client,
+            mock_settings.model_copy(update={"evaluation_hedge_after_seconds": 5.0}),
+        )
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service.evaluate("测试文本"), timeout=0.05)
+        assert client.first_cancelled
+        assert client.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_network_errors_from_both_racers_propagate(self, mock_settings: Settings):
+        client = _DelayedFirstLLM(httpx.ConnectError("refused"))
+        service = EvaluatorService(
+            client,
+            mock_settings.model_copy(update={"evaluation_hedge_after_seconds": 0.01}),
+        )
+
+        # 与非 hedge 路径一致：网络错误直接抛出，不当作解析失败继续重试
+        with pytest.raises(httpx.TransportError):
+            await service.evaluate("测试文本")
+        assert client.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hedge_counts_as_second_attempt(self, mock_settings: Settings):
+        client = _DelayedFirstLLM(ChatResponse(content="不是 JSON", model="test-model"))
+        service = EvaluatorService(
+            client,
+            mock_settings.model_copy(update={"evaluation_hedge_after_seconds": 0.01}),
+        )
+
+        with pytest.raises(Exception):
+            await service.evaluate("测试文本", max_retries=2)
+        assert client.call_count == 2
@@ -0,0 +1,165 @@
+import time
+
+import httpx
+import orjson
+import pytest
+
+from copernicus.config import Settings
+from copernicus.services.llm import (
+    OllamaClient,
+    RateLimiter,
+    _backoff_delay,
+    _is_retryable,
+)
+from copernicus.utils.llm_parse import (
+    extract_json_array,
+    extract_json_object,
+    strip_llm_wrappers,
+    strip_think_tags,
+)
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_unlimited_admits_immediately(self):
+        limiter = RateLimiter()
+
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.acquire(10_000)
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_delays_when_exhausted(self):
+        limiter = RateLimiter(tpm=6000)  # 100 tokens/s
+
+        await limiter.acquire(6000)
+        start = time.monotonic()
+        await limiter.acquire(10)
+        assert time.monotonic() - start >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_pause_blocks_all_callers(self):
+        limiter = RateLimiter()
+        limiter.pause(0.1)
+
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.08
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://llm/api/chat")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize(
+        ("exc", "expected"),
+        [
+            (httpx.ReadTimeout("timeout"), True),
+            (httpx.RemoteProtocolError("disconnected"), True),
+            (_status_error(429), True),
+            (_status_error(502), True),
+            (_status_error(400), False),
+            (_status_error(401), False),
+        ],
+    )
+    def test_is_retryable(self, exc: Exception, expected: bool):
+        assert _is_retryable(exc) is expected
+
+    def test_backoff_is_capped_and_jittered(self):
+        delays = {_backoff_delay(2.0, 1) for _ in range(20)}
+        assert all(2.0 <= d <= 4.0 for d in delays)
+        assert len(delays) > 1
+        assert _backoff_delay(2.0, 20) <= 32.0
+
+
+class TestStreamedContent:
+    @pytest.mark.asyncio
+    async def test_think_tags_are_stripped_once_by_caller(self):
+        # 答案正文中含字面量 </think>：客户端原样返回，只由调用方清理一次
+        pieces = ["a</thi", "nk>b</think>", "c"]
+        body = b"\n".join(
+            orjson.dumps({"message": {"content": p}, "done": False}) for p in pieces
+        ) + b"\n" + orjson.dumps({"model": "m", "done": True})
+
+        client = OllamaClient(Settings(llm_base_url="http://llm"))
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        )
+        try:
+            response = await client.chat([{"role": "user", "content": "hi"}])
+        finally:
+            await client.close()
+
+        assert response.content == "a</think>b</think>c"
+        assert strip_think_tags(response.content) == "b</think>c"
+        assert strip_llm_wrappers(response.content) == "b</think>c"
+
+
+class TestOutputCap:
+    @pytest.mark.parametrize(("cap", "expected"), [(0, None), (512, 512)])
+    @pytest.mark.asyncio
+    async def test_global_cap_is_opt_in(self, cap: int, expected: int | None):
+        sent: list[dict] = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            sent.append(orjson.loads(request.content))
+            return httpx.Response(200, content=orjson.dumps({"model": "m", "done": True}))
+
+        client = OllamaClient(Settings(llm_base_url="http://llm", llm_max_output_tokens=cap))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        try:
+            await client.chat([{"role": "user", "content": "hi"}], think=True)
+        finally:
+            await client.close()
+
+        # 未开启全局上限时不下发 num_predict，避免截断 thinking 导致正文为空
+        assert sent[0]["options"].get("num_predict") == expected
+
+
+class TestStripLlmWrappers:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '<think>a</think>b</think>{"a": 1}',
+            'a</think>b</think>```json\n{"a": 1}\n```',
+            '前<think>x</think>后```json\n{"a": 1}\n```<think>未闭合',
+        ],
+    )
+    def test_matches_sequential_strip(self, text: str):
+        expected = strip_think_tags(text).replace("```json", "").replace("```", "").strip()
+        assert strip_llm_wrappers(text) == expected
+
+
+class TestExtractJson:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ('{"a": 1}', '{"a": 1}'),
+            ('<think>{"draft": 0}</think>\n```json\n{"a": 1}\n```', '{"a": 1}'),
+            ('推理 {"x": 0}</think>前言 {"a": 1} 结语', '{"a": 1}'),
+            ('{"a": 1}<think>{"b": 2}', '{"a": 1}'),
+            ('<think>a</think>{"x": 0}</think>{"a": 1}', '{"a": 1}'),
+            # 括号跨越 think 块时回退正则路径，think 内容被剔除后拼接
+            ('<think>a</think>{"a": <think>x</think>1}', '{"a": 1}'),
+            ('{"a": "```"}', '{"a": ""}'),
+            ("无 JSON", "无 JSON"),
+        ],
+    )
+    def test_extract_object(self, text: str, expected: str):
+        assert extract_json_object(text) == expected
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ('<think>[0]</think>[{"id": 1}]', '[{"id": 1}]'),
+            ('{"violations": []}', "[]"),
+            ('```json\n{"rule_id": "R1"}\n```', '{"rule_id": "R1"}'),
+        ],
+    )
+    def test_extract_array(self, text: str, expected: str):
+        assert extract_json_array(text) == expected
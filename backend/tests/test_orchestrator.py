@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from copernicus.services.pipeline.base import PipelineContext
+from copernicus.services.pipeline.orchestrator import PipelineOrchestrator
+
+
+class _SleepStage:
+    def __init__(self, name: str, delay: float, log: list[str], *, run: bool = True) -> None:
+        self.name = name
+        self._delay = delay
+        self._log = log
+        self._run = run
+
+    async def execute(self, ctx, on_progress=None):
+        await asyncio.sleep(self._delay)
+        self._log.append(self.name)
+        return ctx
+
+    def should_run(self, ctx) -> bool:
+        return self._run
+
+
+class _RendezvousStage(_SleepStage):
+    """置位自己的事件后等待对方分支的事件：串行执行时必然超时，借此确定性地验证并发。"""
+
+    def __init__(self, name: str, mine: asyncio.Event, other: asyncio.Event, log: list[str]) -> None:
+        super().__init__(name, 0, log)
+        self._mine = mine
+        self._other = other
+
+    async def execute(self, ctx, on_progress=None):
+        self._mine.set()
+        await asyncio.wait_for(self._other.wait(), 1)
+        self._log.append(self.name)
+        return ctx
+
+
+class _FailStage(_SleepStage):
+    async def execute(self, ctx, on_progress=None):
+        await asyncio.sleep(self._delay)
+        raise RuntimeError(self.name)
+
+
+class TestParallelBranches:
+    @pytest.mark.asyncio
+    async def test_branches_overlap_and_keep_order(self):
+        log: list[str] = []
+        a_started, b_started = asyncio.Event(), asyncio.Event()
+        orch = PipelineOrchestrator()
+        orch.register(_SleepStage("pre", 0, log))
+        orch.register_parallel(
+            [_RendezvousStage("a1", a_started, b_started, log), _SleepStage("a2", 0, log)],
+            [_RendezvousStage("b1", b_started, a_started, log), _SleepStage("skip", 0, log, run=False)],
+        )
+        orch.register(_SleepStage("post", 0, log))
+
+        # a1 与 b1 互相等待对方已启动：两分支未并发时此处会因 wait_for 超时而失败
+        ctx = await orch.run(PipelineContext())
+
+        assert log[0] == "pre" and log[-1] == "post"
+        assert sorted(log[1:-1]) == ["a1", "a2", "b1"]
+        assert log.index("a1") < log.index("a2")
+        assert set(ctx.processing_times) == {"pre", "a1", "a2", "b1", "post"}
+
+    @pytest.mark.asyncio
+    async def test_branch_failure_cancels_siblings(self):
+        log: list[str] = []
+        orch = PipelineOrchestrator()
+        orch.register_parallel(
+            [_FailStage("boom", 0.01, log)],
+            [_SleepStage("slow", 1.0, log)],
+        )
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await orch.run(PipelineContext())
+        assert log == []
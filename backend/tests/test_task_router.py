@@ -0,0 +1,57 @@
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from copernicus.config import Settings
+from copernicus.routers.task import router as task_router
+from copernicus.schemas.task import TaskStatus
+from copernicus.services.persistence import PersistenceService
+from copernicus.services.pipeline import TranscriptResult
+from copernicus.services.task_store import TaskStore
+
+
+class TestSubmitTranscriptTask:
+    def test_media_is_persisted_before_worker_starts(self, tmp_path):
+        persistence = PersistenceService(tmp_path)
+        seen: dict[str, bytes | None] = {}
+
+        async def _process_transcript(audio_bytes, filename, hotwords, *, on_progress, task_id):
+            # 空闲 worker 会立即取走任务：此时媒体文件必须已完整落盘
+            path = persistence.find_audio(task_id)
+            seen[task_id] = path.read_bytes() if path else None
+            return TranscriptResult(transcript=[], processing_time_ms=1.0)
+
+        store = TaskStore(
+            pipeline=SimpleNamespace(process_transcript=_process_transcript),
+            persistence=persistence,
+            settings=Settings(task_max_workers=1),
+        )
+
+        @asynccontextmanager
+        async def _lifespan(app: FastAPI):
+            store.start()
+            yield
+            await store.stop()
+
+        app = FastAPI(lifespan=_lifespan)
+        app.state.task_store = store
+        app.include_router(task_router)
+
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/v1/tasks/transcript",
+                files={"file": ("test.wav", b"fake-audio-bytes", "audio/wav")},
+            )
+            assert response.status_code == 202
+            task_id = response.json()["task_id"]
+
+            deadline = time.monotonic() + 2.0
+            while store.get(task_id).status != TaskStatus.COMPLETED:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        assert seen == {task_id: b"fake-audio-bytes"}
+        assert store.get(task_id).audio_path == str(persistence.find_audio(task_id))
@@ -1,5 +1,16 @@
-from copernicus.services.asr import Segment
-from copernicus.utils.text import chunk_text, group_segments, merge_chunks
+import pytest
+
+from copernicus.services.asr import Segment, SubSentence
+from copernicus.utils.text import (
+    chunk_text,
+    group_segments,
+    merge_chunks,
+    merge_transcript_entries,
+    pre_merge_segments,
+    smooth_speakers,
+    split_sentences,
+    split_corrected_by_sub_sentences,
+)
 
 
 class TestChunkText:
@@ -44,6 +55,9 @@ class TestMergeChunks:
         # First chunk fully kept, subsequent chunks skip first 3 chars
         assert result == "ABCDE" + "_FG" + "GHIJ"
 
+    def test_zero_overlap_concatenates(self):
+        assert merge_chunks(["AB", "CD", "EF"], overlap=0) == "ABCDEF"
+
     def test_overlap_larger_than_chunk(self):
         chunks = ["AB", "X"]
         result = merge_chunks(chunks, overlap=5)
@@ -51,6 +65,86 @@ class TestMergeChunks:
         assert result == "AB"
 
 
+def _entry(ts: int, speaker: str, text: str) -> dict:
+    return {
+        "timestamp": f"00:{ts // 1000:02d}",
+        "timestamp_ms": ts,
+        "speaker": speaker,
+        "text": text,
+        "text_corrected": text.upper(),
+    }
+
+
+class TestMergeTranscriptEntries:
+    def test_empty(self):
+        assert merge_transcript_entries([]) == []
+
+    def test_merges_same_speaker_within_gap(self):
+        entries = [_entry(0, "A", "a"), _entry(1000, "A", "b"), _entry(1500, "B", "c"), _entry(9000, "B", "d")]
+        merged = merge_transcript_entries(entries, gap_threshold_ms=2000)
+
+        assert [(m["timestamp_ms"], m["speaker"], m["text"], m["text_corrected"]) for m in merged] == [
+            (0, "A", "ab", "AB"),
+            (1500, "B", "c", "C"),
+            (9000, "B", "d", "D"),
+        ]
+        # 输出为新 dict，不改动输入
+        assert entries[0]["text"] == "a"
+
+
+class TestPreMergeSegments:
+    def test_merges_same_speaker_within_gap(self):
+        segs = [
+            Segment(text="ab", start_ms=0, end_ms=100, confidence=0.9, speaker=0),
+            Segment(text="c", start_ms=200, end_ms=300, confidence=0.6, speaker=0),
+            Segment(text="d", start_ms=2000, end_ms=2100, confidence=0.5, speaker=0),
+            Segment(text="e", start_ms=2150, end_ms=2200, confidence=0.4, speaker=1),
+        ]
+        merged = pre_merge_segments(segs, gap_ms=500)
+
+        assert [(m.text, m.start_ms, m.end_ms, m.speaker) for m in merged] == [
+            ("abc", 0, 300, 0),
+            ("d", 2000, 2100, 0),
+            ("e", 2150, 2200, 1),
+        ]
+        assert merged[0].confidence == pytest.approx(0.8)
+        assert [sub.text for sub in merged[0].sub_sentences] == ["ab", "c"]
+
+    def test_single_speaker_collapses_to_one_segment(self):
+        segs = [
+            Segment(text="", start_ms=0, end_ms=100, confidence=0.1, speaker=None),
+            Segment(text="abc", start_ms=150, end_ms=300, confidence=0.9, speaker=None),
+            Segment(text="d", start_ms=400, end_ms=500, confidence=0.5, speaker=None),
+        ]
+        merged = pre_merge_segments(segs, gap_ms=500)
+
+        assert len(merged) == 1
+        assert (merged[0].text, merged[0].start_ms, merged[0].end_ms) == ("abcd", 0, 500)
+        assert merged[0].confidence == pytest.approx(0.8)
+        assert [sub.text for sub in merged[0].sub_sentences] == ["", "abc", "d"]
+
+
+class TestSmoothSpeakers:
+    def test_short_flicker_is_absorbed(self):
+        segs = [
+            Segment(text="a", start_ms=0, end_ms=1000, speaker=0),
+            Segment(text="b", start_ms=1000, end_ms=1500, speaker=1),
+            Segment(text="c", start_ms=1500, end_ms=2500, speaker=0),
+            Segment(text="d", start_ms=2500, end_ms=5000, speaker=1),
+            Segment(text="e", start_ms=5000, end_ms=6000, speaker=0),
+        ]
+        assert [s.speaker for s in smooth_speakers(segs)] == [0, 0, 0, 1, 0]
+
+
+class TestSplitSentences:
+    def test_splits_after_terminators_and_drops_blank(self):
+        assert split_sentences("你好。再见！\n  \n好的") == ["你好。", "再见！", "好的"]
+
+    def test_no_terminator_returns_whole_text(self):
+        assert split_sentences("没有标点") == ["没有标点"]
+        assert split_sentences("") == []
+
+
 class TestGroupSegments:
     def test_empty_segments(self):
         assert group_segments([]) == []
@@ -90,3 +184,43 @@ class TestGroupSegments:
         assert len(groups) == 2
         assert len(groups[0]) == 2
         assert len(groups[1]) == 2
+
+
+class TestSplitCorrectedBySubSentences:
+    def test_single_sub_sentence_keeps_span(self):
+        subs = [SubSentence(text="原文", start_ms=100, end_ms=900)]
+        result = split_corrected_by_sub_sentences("纠正后。", subs)
+        assert len(result) == 1
+        assert (result[0].start_ms, result[0].end_ms) == (100, 900)
+
+    def test_splits_proportionally_and_pins_last_to_end(self):
+        subs = [
+            SubSentence(text="一", start_ms=0, end_ms=500),
+            SubSentence(text="二", start_ms=500, end_ms=1000),
+        ]
+        result = split_corrected_by_sub_sentences("第一句。第二句。", subs)
+        assert [r.text for r in result] == ["第一句。", "第二句。"]
+        assert result[0].start_ms == 0
+        assert result[0].end_ms == result[1].start_ms == 500
+        assert result[1].end_ms == 1000
+
+    def test_skips_whitespace_only_fragments(self):
+        subs = [
+            SubSentence(text="一", start_ms=0, end_ms=500),
+            SubSentence(text="二", start_ms=500, end_ms=1000),
+        ]
+        result = split_corrected_by_sub_sentences("第一句。\n\n第二句", subs)
+        assert [r.text for r in result] == ["第一句。", "第二句"]
+        assert result[-1].end_ms == 1000
+
+    def test_blank_fragments_do_not_skew_timestamps(self):
+        subs = [
+            SubSentence(text="一", start_ms=0, end_ms=500),
+            SubSentence(text="二", start_ms=500, end_ms=1000),
+        ]
+        # 空白片段不计入比例总长：两段等长，分界应落在正中
+        result = split_corrected_by_sub_sentences("一二三。\n\n\n\n四五六。", subs)
+        assert [(r.text, r.start_ms, r.end_ms) for r in result] == [
+            ("一二三。", 0, 500),
+            ("四五六。", 500, 1000),
+        ]
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -64,6 +65,20 @@ class TestTranscribeTranscriptEndpoint:
 
         assert response.status_code == 422
 
+    def test_transcribe_transcript_too_large(self, client, mock_pipeline, monkeypatch):
+        monkeypatch.setattr(
+            "copernicus.routers.transcription._MAX_UPLOAD_BYTES", 0
+        )
+        mock_pipeline.process_transcript = AsyncMock()
+
+        response = client.post(
+            "/api/v1/transcribe/transcript",
+            files={"file": ("test.wav", b"fake", "audio/wav")},
+        )
+
+        assert response.status_code == 413
+        mock_pipeline.process_transcript.assert_not_called()
+
 
 class TestHealthEndpoint:
     def test_health_check(self, client, mock_pipeline):
@@ -73,3 +88,18 @@ class TestHealthEndpoint:
         data = response.json()
         assert data["asr_loaded"] is True
         assert data["llm_reachable"] is True
+
+    def test_health_check_llm_timeout(self, client, mock_pipeline, monkeypatch):
+        async def _hang() -> bool:
+            await asyncio.sleep(10)
+            return True
+
+        monkeypatch.setattr(
+            "copernicus.routers.transcription._HEALTH_PROBE_TIMEOUT", 0.01
+        )
+        mock_pipeline._corrector.is_reachable = _hang
+
+        response = client.get("/api/v1/health")
+
+        assert response.status_code == 200
+        assert response.json()["llm_reachable"] is False